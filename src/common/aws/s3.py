@@ -1,19 +1,47 @@
 """Lightweight S3 helpers with server-side encryption (SSE-S3)."""
 from __future__ import annotations
+import gzip
 import json
 import os
 from typing import Any, Dict
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+try:
+    import orjson
+
+    def _json_bytes(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_bytes(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    _json_loads = json.loads
+
 _S3 = None
 
+# Keep pooled connections alive between bursts and bound socket waits well
+# below botocore's 60s default.
+_S3_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# Bodies at or below this size are uploaded as-is; compressing them costs
+# more CPU than it saves on the wire. Keys keep their name either way, so
+# readers must honour ContentEncoding (get_json does).
+COMPRESS_MIN_BYTES = 1024
+
 def _client():
     global _S3
     if _S3 is None:
-        _S3 = boto3.client("s3", region_name=os.getenv("AWS_REGION"))
+        _S3 = boto3.client("s3", region_name=os.getenv("AWS_REGION"), config=_S3_CONFIG)
     return _S3
 
 
@@ -23,13 +51,34 @@ def put_json(bucket: str, key: str, data: Dict[str, Any]) -> None:
     """Put a JSON document with SSE-S3 and minimal retries.
 
     Retries only on AWS client errors. JSON is minified deterministically.
+    Bodies larger than ``COMPRESS_MIN_BYTES`` are gzip-compressed and stored
+    with ``ContentEncoding=gzip``; smaller ones are stored uncompressed. The
+    key and ``ContentType`` are the same in both cases, so read objects back
+    with :func:`get_json`.
     """
-    body = json.dumps(data, separators=(",", ":"))
+    body = _json_bytes(data)
+    put_params: Dict[str, Any] = {
+        "Bucket": bucket,
+        "Key": key,
+        "ContentType": "application/json",
+        "ServerSideEncryption": "AES256",
+    }
+    if len(body) > COMPRESS_MIN_BYTES:
+        put_params["ContentEncoding"] = "gzip"
+        body = gzip.compress(body, compresslevel=1)
     logging.getLogger(__name__).debug("put_json bucket=%s key=%s bytes=%d", bucket, key, len(body))
-    _client().put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=body.encode("utf-8"),
-        ContentType="application/json",
-        ServerSideEncryption="AES256",
-    )
+    _client().put_object(Body=body, **put_params)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.2, max=2),
+       retry=retry_if_exception_type(ClientError))
+def get_json(bucket: str, key: str) -> Dict[str, Any]:
+    """Get a JSON document written by :func:`put_json`.
+
+    Decompresses the body when the object is stored with ``ContentEncoding=gzip``.
+    """
+    obj = _client().get_object(Bucket=bucket, Key=key)
+    body = obj["Body"].read()
+    if obj.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    return _json_loads(body)
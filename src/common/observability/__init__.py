@@ -1,19 +1,34 @@
 """
 Observability module with AWS Lambda Powertools integration
+
+Submodules are imported lazily (PEP 562) so that importing one of them, e.g.
+``common.observability.powertools``, does not also pull in X-Ray and the
+Powertools metrics stack at cold start.
 """
 
-from .logger import setup_structured_logging, get_logger, log_with_context
-from .tracer import setup_tracing, trace_function, get_tracer
-from .metrics import setup_metrics, record_metric, get_metrics
+import importlib
+
+_EXPORTS = {
+    "setup_structured_logging": ".logger",
+    "get_logger": ".logger",
+    "log_with_context": ".logger",
+    "setup_tracing": ".tracer",
+    "trace_function": ".tracer",
+    "get_tracer": ".tracer",
+    "setup_metrics": ".metrics",
+    "record_metric": ".metrics",
+    "get_metrics": ".metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    "setup_structured_logging",
-    "get_logger", 
-    "log_with_context",
-    "setup_tracing",
-    "trace_function",
-    "get_tracer",
-    "setup_metrics",
-    "record_metric",
-    "get_metrics",
-]
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -5,9 +5,12 @@ Structured logging with AWS Lambda Powertools
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
-from datetime import datetime
-from functools import wraps
+import random
+import re
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache, partial, wraps
+from itertools import islice
 
 try:
     from aws_lambda_powertools import Logger
@@ -16,11 +19,54 @@ try:
 except ImportError:
     AWS_POWERTOOLS_AVAILABLE = False
 
+try:
+    import orjson
+    
+    def _json_dumps(data: Dict[str, Any]) -> str:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. ints wider than 64 bits, which the json module handles
+            return json.dumps(data)
+except ImportError:
+    def _json_dumps(data: Dict[str, Any]) -> str:
+        return json.dumps(data)
+
+# Translation table for log sanitization: line breaks and tabs become
+# spaces, every other C0 control character and DEL is dropped.
+_CTRL_TABLE = dict.fromkeys(list(range(32)) + [127], None)
+_CTRL_TABLE.update({ord('\n'): ' ', ord('\r'): ' ', ord('\t'): ' '})
+_CTRL_TRANS = str.maketrans(_CTRL_TABLE)
+
+# Keys containing any of these fragments are redacted
+_SENSITIVE_KEY_RE = re.compile(
+    r'password|token|key|secret|credential|auth|session|cookie|ssn|credit_card',
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=1024)
+def _clean_log_key(key: str) -> Tuple[str, bool]:
+    """Sanitized form of a log field name and whether its value is redacted"""
+    clean_key = key[:50].replace('.', '_').replace(' ', '_')
+    return clean_key, _SENSITIVE_KEY_RE.search(clean_key) is not None
+
+# Timezone-aware replacement for the deprecated datetime.utcnow
+_utc_now = partial(datetime.now, timezone.utc)
+
+# Marks records whose message StructuredLogger already serialized to JSON
+_STRUCTURED_EXTRA = {"_structured": True}
+
+# Fields kept per log record (and per nested dict)
+_MAX_LOG_FIELDS = 20
+
+# Nested dicts deeper than this are logged as "[COMPLEX_OBJECT]"
+_MAX_NESTED_DEPTH = 3
+
 # Fallback logger configuration
 class StructuredLogger:
     """Structured logger with security-aware formatting"""
     
-    def __init__(self, name: str, level: str = "INFO"):
+    def __init__(self, name: str, level: str = "INFO", sample_rate: float = 1.0):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper()))
         
@@ -29,6 +75,20 @@ class StructuredLogger:
             formatter = StructuredFormatter()
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
+        
+        # Fraction of DEBUG records kept; seeded per worker for reproducibility
+        self._sample_rate = sample_rate
+        self._random = random.Random(os.getpid())
+        
+        # Resolved once; environment is fixed for the life of the process
+        self._service = os.getenv("SERVICE_NAME", "petty")
+        self._environment = os.getenv("ENVIRONMENT", "development")
+        self._log_fn = {
+            "DEBUG": (logging.DEBUG, self.logger.debug),
+            "INFO": (logging.INFO, self.logger.info),
+            "WARNING": (logging.WARNING, self.logger.warning),
+            "ERROR": (logging.ERROR, self.logger.error),
+        }
     
     def info(self, message: str, **kwargs) -> None:
         self._log("INFO", message, **kwargs)
@@ -44,19 +104,26 @@ class StructuredLogger:
     
     def _log(self, level: str, message: str, **kwargs) -> None:
         """Log with structured format"""
+        level_no, log_fn = self._log_fn[level]
+        # Skip sanitization and serialization for records that would be dropped
+        if not self.logger.isEnabledFor(level_no):
+            return
+        if level_no == logging.DEBUG and self._random.random() >= self._sample_rate:
+            return
+        
         # Sanitize kwargs to prevent log injection
         sanitized_kwargs = self._sanitize_log_data(kwargs)
         
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_now().isoformat(),
             "level": level,
             "message": self._sanitize_message(message),
-            "service": os.getenv("SERVICE_NAME", "petty"),
-            "environment": os.getenv("ENVIRONMENT", "development"),
+            "service": self._service,
+            "environment": self._environment,
             **sanitized_kwargs
         }
         
-        getattr(self.logger, level.lower())(json.dumps(log_data))
+        log_fn(_json_dumps(log_data), extra=_STRUCTURED_EXTRA)
     
     def _sanitize_message(self, message: str) -> str:
         """Sanitize log message to prevent injection"""
@@ -64,31 +131,18 @@ class StructuredLogger:
             message = str(message)
         
         # Remove newlines and control characters
-        message = message.replace('\n', ' ').replace('\r', ' ')
-        message = ''.join(char for char in message if ord(char) >= 32 or char == ' ')
-        
-        return message[:1000]  # Limit message length
+        return message.translate(_CTRL_TRANS)[:1000]  # Limit message length
     
-    def _sanitize_log_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _sanitize_log_data(self, data: Dict[str, Any], depth: int = 0) -> Dict[str, Any]:
         """Sanitize log data to prevent injection and remove PII"""
         sanitized = {}
         
-        # Fields that should be redacted
-        sensitive_fields = {
-            'password', 'token', 'key', 'secret', 'credential',
-            'auth', 'session', 'cookie', 'ssn', 'credit_card'
-        }
-        
-        for key, value in data.items():
-            # Limit number of fields
-            if len(sanitized) >= 20:
-                break
-            
-            # Sanitize key
-            clean_key = str(key)[:50].replace('.', '_').replace(' ', '_')
-            
-            # Check if field should be redacted
-            if any(sensitive in clean_key.lower() for sensitive in sensitive_fields):
+        # Limit number of fields
+        for key, value in islice(data.items(), _MAX_LOG_FIELDS):
+            # Sanitize key and check if field should be redacted; field names
+            # repeat across records, so the result is cached per name
+            clean_key, redact = _clean_log_key(key if type(key) is str else str(key))
+            if redact:
                 sanitized[clean_key] = "[REDACTED]"
                 continue
             
@@ -99,7 +153,7 @@ class StructuredLogger:
                 clean_value = value
             elif isinstance(value, dict):
                 # Recursively sanitize nested dict (limit depth)
-                clean_value = self._sanitize_log_data(value) if len(str(value)) < 1000 else "[COMPLEX_OBJECT]"
+                clean_value = self._sanitize_log_data(value, depth + 1) if depth < _MAX_NESTED_DEPTH else "[COMPLEX_OBJECT]"
             elif isinstance(value, list):
                 # Sanitize list elements (limit length)
                 clean_value = [self._sanitize_message(str(item)) for item in value[:10]]
@@ -114,21 +168,23 @@ class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
     def format(self, record):
-        # If message is already JSON, return as-is
-        try:
-            json.loads(record.getMessage())
-            return record.getMessage()
-        except (json.JSONDecodeError, TypeError):
-            # Format as structured log
-            log_data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "level": record.levelname,
-                "message": record.getMessage(),
-                "module": record.module,
-                "function": record.funcName,
-                "line": record.lineno,
-            }
-            return json.dumps(log_data)
+        message = record.getMessage()
+        
+        # StructuredLogger emits pre-serialized JSON objects and flags them;
+        # anything else, even if it looks like JSON, gets wrapped
+        if getattr(record, "_structured", False):
+            return message
+        
+        # Format as structured log
+        log_data = {
+            "timestamp": _utc_now().isoformat(),
+            "level": record.levelname,
+            "message": message,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        return _json_dumps(log_data)
 
 # Global logger instance
 _logger: Optional[StructuredLogger] = None
@@ -3,6 +3,8 @@ Production-grade metrics collection module with AWS CloudWatch integration
 Handles application metrics and KPIs for monitoring and alerting
 """
 
+import atexit
+import json
 import os
 import logging
 import time
@@ -13,7 +15,7 @@ from functools import wraps
 HAS_METRICS = False
 try:
     from aws_lambda_powertools import Metrics
-    from aws_lambda_powertools.metrics import MetricUnit
+    from aws_lambda_powertools.metrics import MetricUnit, single_metric
     HAS_METRICS = True
 except ImportError:
     logging.warning("AWS Lambda Powertools Metrics not installed - using stub implementation")
@@ -81,6 +83,13 @@ def record_metric(name: str, value: float = 1, unit: str = MetricUnit.Count, dim
     """
     Record a metric to CloudWatch.
     
+    Each metric is published immediately as its own EMF record under this
+    client's namespace. Powertools ``Metrics`` instances share one metric
+    set, so buffering here would let another instance (e.g. the one in
+    powertools.py) publish these values under its namespace, and outside a
+    ``log_metrics`` handler they would wait for an interpreter exit that a
+    frozen Lambda environment may never reach.
+    
     Args:
         name: Metric name
         value: Metric value
@@ -91,11 +100,20 @@ def record_metric(name: str, value: float = 1, unit: str = MetricUnit.Count, dim
     
     if HAS_METRICS:
         try:
-            metrics.add_metric(name=name, value=value, unit=unit)
-            if dimensions:
-                for key, val in dimensions.items():
+            if isinstance(metrics, Metrics):
+                with single_metric(
+                    name=name,
+                    unit=unit,
+                    value=value,
+                    namespace=metrics.namespace,
+                    default_dimensions={"service": metrics.service},
+                ) as metric:
+                    for key, val in (dimensions or {}).items():
+                        metric.add_dimension(name=key, value=val)
+            else:
+                metrics.add_metric(name=name, value=value, unit=unit)
+                for key, val in (dimensions or {}).items():
                     metrics.add_dimension(name=key, value=val)
-            metrics.flush_metrics()
         except Exception as e:
             logging.error(f"Failed to record metric {name}: {e}")
     else:
@@ -103,9 +121,24 @@ def record_metric(name: str, value: float = 1, unit: str = MetricUnit.Count, dim
         dim_str = f", dimensions={dimensions}" if dimensions else ""
         logging.info(f"METRIC: {name}={value} {unit}{dim_str}")
 
+@atexit.register
+def flush_metrics() -> None:
+    """Log any metrics still buffered by the stub client"""
+    # Powertools clients never hold metrics here; flushing one would publish
+    # the shared metric set of other Metrics instances under this namespace
+    if not isinstance(_metrics_client, StubMetrics) or not _metrics_client.metrics:
+        return
+    try:
+        _metrics_client.flush_metrics()
+    except Exception as e:
+        logging.error(f"Failed to flush metrics: {e}")
+
 class StubMetrics:
     """Stub implementation of CloudWatch Metrics for local development"""
     
+    # Buffered metrics are logged once this many have accumulated
+    FLUSH_THRESHOLD = 100
+    
     def __init__(self, namespace: str, service: str):
         self.namespace = namespace
         self.service = service
@@ -120,19 +153,20 @@ class StubMetrics:
             "unit": unit,
             "timestamp": time.time()
         })
+        if len(self.metrics) >= self.FLUSH_THRESHOLD:
+            self.flush_metrics()
         
     def add_dimension(self, name: str, value: str) -> None:
         """Add a dimension to all metrics"""
         self.dimensions[name] = value
         
     def flush_metrics(self) -> None:
-        """Log metrics and clear the buffer"""
-        for metric in self.metrics:
-            dims = ", ".join([f"{k}={v}" for k, v in self.dimensions.items()])
-            dims_str = f", dimensions=[{dims}]" if dims else ""
-            logging.info(
-                f"STUB METRIC: {metric['name']}={metric['value']} "
-                f"{metric['unit']}{dims_str}"
-            )
+        """Log metrics as a single batched line and clear the buffer"""
+        if self.metrics and logging.getLogger().isEnabledFor(logging.INFO):
+            payload = [
+                {"n": m["name"], "v": m["value"], "u": getattr(m["unit"], "value", m["unit"])}
+                for m in self.metrics
+            ]
+            logging.info("STUB METRICS: %s dimensions=%s", json.dumps(payload), self.dimensions)
         self.metrics = []
         self.dimensions = {}
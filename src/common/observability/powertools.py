@@ -7,16 +7,43 @@ This file intentionally keeps implementation simple and robust. It:
  - Avoids complex refactors to remain easy to audit
 """
 
+from __future__ import annotations
+
+import atexit
 import json
+import logging
 import os
 import sys
+import threading
 import time
-import uuid
 import re
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Callable
-from functools import wraps
-from contextlib import contextmanager
+from functools import lru_cache, wraps
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import orjson  # type: ignore
+
+    def _json_dumps(obj: Any) -> str:
+        # OPT_NON_STR_KEYS keeps parity with json.dumps for int/enum dict keys
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. ints wider than 64 bits, which default= never sees
+            return json.dumps(obj, default=str)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+    _json_loads = json.loads
+
+class _StubSubsegment:
+    def put_metadata(self, *_, **__):
+        return None
+    def add_exception(self, *_, **__):
+        return None
 
 try:  # Attempt real powertools import
     from aws_lambda_powertools import Logger, Tracer, Metrics  # type: ignore
@@ -27,25 +54,68 @@ except ImportError:  # Provide stubs
     POWertools_AVAILABLE = False
 
     class _StubLogger:
-        def __init__(self, service: str, level: str = "INFO", sampling_rate: float = 0.1):
+        # Lines are buffered and written to stdout in blocks of about this size,
+        # or once this many seconds have passed since the last write
+        BUFFER_BYTES = 64 * 1024
+        FLUSH_INTERVAL = 0.1
+        # Lines at these levels are written out straight away
+        _FLUSH_LEVELS = frozenset(("WARNING", "ERROR"))
+
+        def __init__(self, service: str, level: str = "INFO", sample_rate: float = 0.1, **_kwargs):
             self.service = service
             self.level = level
+            self.log_level = logging.getLevelName(level.upper())
             self.correlation_id = None
+            self._keys: Dict[str, Any] = {}
+            self._buffer: list = []
+            self._buffered = 0
+            self._buffer_lock = threading.Lock()
+            self._last_flush = time.monotonic()
+            atexit.register(self.flush)
 
-        def _write(self, level: str, message: str, extra: Optional[Dict[str, Any]] = None):
-            try:
-                print(f"[{level}] {message} | extra={json.dumps(extra) if extra else ''}")
-            except Exception:
-                print(f"[{level}] {message}")
-
-        def info(self, message: str, extra: Optional[Dict[str, Any]] = None):
-            self._write("INFO", message, extra)
-        def warning(self, message: str, extra: Optional[Dict[str, Any]] = None):
-            self._write("WARNING", message, extra)
-        def error(self, message: str, extra: Optional[Dict[str, Any]] = None):
-            self._write("ERROR", message, extra)
+        def flush(self):
+            with self._buffer_lock:
+                pending, self._buffer, self._buffered = self._buffer, [], 0
+                self._last_flush = time.monotonic()
+            if pending:
+                sys.stdout.write("".join(pending))
+                sys.stdout.flush()
+
+        def _write(self, level: str, message: str, args: tuple = (), extra: Optional[Dict[str, Any]] = None):
+            if args:
+                message = message % args
+            if self._keys:
+                extra = {**self._keys, **(extra or {})}
+            # _json_dumps stringifies unknown types, so there is no fallback path
+            payload = _json_dumps(extra) if extra else ''
+            line = f"[{level}] {message} | extra={payload}\n"
+            with self._buffer_lock:
+                self._buffer.append(line)
+                self._buffered += len(line)
+                due = (
+                    self._buffered >= self.BUFFER_BYTES
+                    or level in self._FLUSH_LEVELS
+                    or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL
+                )
+            if due:
+                self.flush()
+
+        def debug(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None, **_kwargs):
+            if self.log_level <= logging.DEBUG:
+                self._write("DEBUG", message, args, extra)
+        def info(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None, **_kwargs):
+            self._write("INFO", message, args, extra)
+        def warning(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None, **_kwargs):
+            self._write("WARNING", message, args, extra)
+        def error(self, message: str, *args: Any, extra: Optional[Dict[str, Any]] = None, **_kwargs):
+            self._write("ERROR", message, args, extra)
+        def append_keys(self, **keys: Any):
+            self._keys.update(keys)
+        def get_current_keys(self) -> Dict[str, Any]:
+            return self._keys
         def set_correlation_id(self, correlation_id: str):
             self.correlation_id = correlation_id
+            self.append_keys(correlation_id=correlation_id)
         def inject_lambda_context(self, **_kwargs):
             def decorator(func: Callable):
                 @wraps(func)
@@ -54,12 +124,6 @@ except ImportError:  # Provide stubs
                 return wrapper
             return decorator
 
-    class _StubSubsegment:
-        def put_metadata(self, *_, **__):
-            return None
-        def add_exception(self, *_, **__):
-            return None
-
     class _StubTracer:
         disabled: bool = True
         def __init__(self, *_, **__):
@@ -104,10 +168,28 @@ except ImportError:  # Provide stubs
 
 try:
     import boto3  # type: ignore  # noqa: F401
+    from botocore.config import Config  # type: ignore
     _BOTO3_AVAILABLE = True
+    # Health probes should fail fast rather than hold the invocation
+    _PROBE_CONFIG = Config(connect_timeout=1, read_timeout=1, retries={"max_attempts": 1})
 except Exception:  # pragma: no cover
     _BOTO3_AVAILABLE = False
 
+HEALTH_S3_BUCKET = os.getenv("HEALTH_S3_BUCKET")
+# Probes still running after this many seconds are reported as "unknown"
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "0.5"))
+_probe_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-probe")
+
+@lru_cache(maxsize=1)
+def _session() -> Any:
+    """One boto3 Session so all probe clients share its loaded service models"""
+    return boto3.session.Session()  # type: ignore
+
+@lru_cache(maxsize=None)
+def _client(name: str) -> Any:
+    """Return a process-wide boto3 client; client construction is expensive"""
+    return _session().client(name, config=_PROBE_CONFIG)
+
 def _unicode_enabled() -> bool:
     if os.getenv("DISABLE_UNICODE_LOGS", "0") == "1":
         return False
@@ -117,97 +199,207 @@ def _unicode_enabled() -> bool:
     return True
 EMOJI_ENABLED = _unicode_enabled()
 
+_EMOJI_RE = re.compile(r"[\U00010000-\U0010FFFF]")
+
 def _sanitize_message(msg: str) -> str:
-    if EMOJI_ENABLED:
+    if EMOJI_ENABLED or msg.isascii():
         return msg
-    return re.sub(r"[\U00010000-\U0010FFFF]", "", msg)
+    return _EMOJI_RE.sub("", msg)
 
-SERVICE_NAME = os.getenv("SERVICE_NAME", "petty-api")
+# SERVICE_NAME is canonical; fall back to the Powertools-native variable
+SERVICE_NAME = os.getenv("SERVICE_NAME") or os.getenv("POWERTOOLS_SERVICE_NAME", "petty-api")
 METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "Petty")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLING_RATE", "0.1"))
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+SERVICE_VERSION = os.getenv("SERVICE_VERSION", "0.1.0")
 
-logger = Logger(service=SERVICE_NAME, level=LOG_LEVEL, sample_rate=LOG_SAMPLE_RATE)
-tracer = Tracer(service=SERVICE_NAME, disabled=os.getenv("DISABLE_TRACING", "false").lower() == "true")
+logger = Logger(
+    service=SERVICE_NAME,
+    level=LOG_LEVEL,
+    sample_rate=LOG_SAMPLE_RATE,
+    json_serializer=_json_dumps,
+    json_deserializer=_json_loads,
+    json_default=str,
+)
+_TRACING_DISABLED = os.getenv("DISABLE_TRACING", "false").lower() == "true"
+tracer = Tracer(service=SERVICE_NAME, disabled=_TRACING_DISABLED)
+# The tracer can also disable itself (stub tracer, or Powertools outside Lambda)
+_TRACING_DISABLED = _TRACING_DISABLED or bool(getattr(tracer, "disabled", False))
+_METRICS_DISABLED = os.getenv("DISABLE_METRICS", "false").lower() == "true"
 metrics = Metrics(namespace=METRICS_NAMESPACE, service=SERVICE_NAME)
 
+_UNIT_MS = MetricUnit.Milliseconds
+_UNIT_COUNT = MetricUnit.Count
+_UNIT_PCT = MetricUnit.Percent
+
+@lru_cache(maxsize=256)
+def _operation_metric_names(operation: str) -> tuple:
+    """(duration, errors) metric names for an operation"""
+    return f"{operation}_duration", f"{operation}_errors"
+
+# Shared no-op scope used by trace_operation when tracing is off
+_NOOP_SUBSEGMENT = _StubSubsegment()
+_NOOP_SCOPE = nullcontext(_NOOP_SUBSEGMENT)
+
+_CID_HEADER = "x-correlation-id"
+
+@lru_cache(maxsize=1)
+def _iso_second(whole: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(whole))
+
+def _fast_utcnow_iso() -> str:
+    """UTC now in datetime.isoformat() layout; the date/time part is reused within a second"""
+    t = time.time()
+    whole = int(t)
+    return f"{_iso_second(whole)}.{int((t - whole) * 1e6):06d}+00:00"
+
+# Correlation IDs are sliced from a per-thread block of urandom bytes so the
+# syscall happens once per 256 IDs. They are identifiers, not secrets.
+_CID_POOL_BYTES = 4096
+_cid_pool = threading.local()
+
+def _new_cid() -> str:
+    """Random 128-bit correlation ID as 32 hex chars"""
+    pos = getattr(_cid_pool, "pos", _CID_POOL_BYTES)
+    if pos >= _CID_POOL_BYTES:
+        _cid_pool.buf = os.urandom(_CID_POOL_BYTES)
+        pos = 0
+    _cid_pool.pos = pos + 16
+    return _cid_pool.buf[pos:pos + 16].hex()
+
+def _info_enabled() -> bool:
+    """True when INFO records would be emitted (level may change per invocation)"""
+    return logger.log_level <= logging.INFO
+
+def _warning_enabled() -> bool:
+    return logger.log_level <= logging.WARNING
+
+class _MetricBuffer:
+    """Aggregates metrics per invocation before they reach Powertools.
+
+    Count metrics with the same name are summed into one value; other units
+    keep every value. ``flush`` hands the aggregated set to ``metrics`` so
+    ``log_metrics`` serializes a single, smaller EMF record.
+    """
+
+    # EMF accepts at most 100 values per metric; flush before reaching it
+    MAX_VALUES = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, unit: Any, value: float) -> None:
+        with self._lock:
+            entry = self._pending.get(name)
+            if entry is None:
+                entry = self._pending[name] = {"unit": unit, "values": []}
+            if unit == _UNIT_COUNT and entry["values"]:
+                entry["values"][0] += value
+            else:
+                entry["values"].append(value)
+            full = len(entry["values"]) >= self.MAX_VALUES
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for name, entry in pending.items():
+            for value in entry["values"]:
+                metrics.add_metric(name=name, unit=entry["unit"], value=value)
+
+_metric_buffer = _MetricBuffer()
+
+@atexit.register
+def _flush_metrics_at_exit() -> None:
+    """Publish metrics recorded outside lambda_handler_with_observability"""
+    _metric_buffer.flush()
+    if getattr(metrics, "metric_set", None):
+        try:
+            metrics.flush_metrics()
+        except Exception:  # interpreter is shutting down; nothing left to report to
+            pass
+
+def _emit_log(level: str, message: str, *args: Any, extra: Dict[str, Any]) -> None:
+    # stacklevel=3 reports the caller of _emit_log, not this helper, as the location
+    getattr(logger, level)(message, *args, extra=extra, stacklevel=3)
+
+@atexit.register
+def flush_logs() -> None:
+    """Write out any log lines buffered by the stub logger"""
+    if not POWertools_AVAILABLE:
+        logger.flush()
+
 class ObservabilityManager:
     """Centralized observability management (simple version)."""
+    __slots__ = ("service_name", "environment", "version", "correlation_id")
 
     def __init__(self):
         self.service_name = SERVICE_NAME
-        self.environment = os.getenv("ENVIRONMENT", "development")
-        self.version = os.getenv("SERVICE_VERSION", "0.1.0")
-        self.correlation_id = str(uuid.uuid4())
+        self.environment = ENVIRONMENT
+        self.version = SERVICE_VERSION
+        self.set_correlation_id(_new_cid())
 
     
     def set_correlation_id(self, correlation_id: str) -> None:
         """Set correlation ID for request tracing"""
         self.correlation_id = correlation_id
-        logger.set_correlation_id(correlation_id)
+        logger.append_keys(correlation_id=correlation_id)
     
     def log_business_event(self, event_name: str, **kwargs) -> None:
         """Log important business events with structured data"""
-        logger.info(
-            _sanitize_message(f"Business Event: {event_name}"),
-            extra={
-                "event_type": "business",
-                "event_name": event_name,
-                "correlation_id": self.correlation_id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "service": self.service_name,
-                "environment": self.environment,
-                **kwargs
-            }
-        )
+        if not _info_enabled():
+            return
+        extra = {
+            "event_type": "business",
+            "event_name": event_name,
+            "environment": self.environment,
+        }
+        if kwargs:
+            extra.update(kwargs)
+        _emit_log("info", "Business Event: %s", _sanitize_message(event_name), extra=extra)
     
     def log_security_event(self, event_type: str, severity: str, details: Dict[str, Any]) -> None:
         """Log security-related events with high priority"""
-        logger.warning(
-            _sanitize_message(f"Security Event: {event_type}"),
-            extra={
-                "event_type": "security",
-                "security_event": event_type,
-                "severity": severity,
-                "correlation_id": self.correlation_id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "service": self.service_name,
-                **details
-            }
-        )
+        if not _warning_enabled():
+            return
+        extra = {
+            "event_type": "security",
+            "security_event": event_type,
+            "severity": severity,
+        }
+        if details:
+            extra.update(details)
+        _emit_log("warning", "Security Event: %s", _sanitize_message(event_type), extra=extra)
+    
+    def record_performance_metrics(self, operation: str, duration_ms: float, success: bool = True) -> None:
+        """Add performance metrics for an operation without logging"""
+        # Call counts come from the SampleCount statistic of the duration metric
+        duration_name, errors_name = _operation_metric_names(operation)
+        _metric_buffer.add(duration_name, _UNIT_MS, duration_ms)
+        
+        if not success:
+            _metric_buffer.add(errors_name, _UNIT_COUNT, 1)
     
     def log_performance_metric(self, operation: str, duration_ms: float, success: bool = True) -> None:
         """Log performance metrics for operations"""
         # Add to CloudWatch metrics
-        metrics.add_metric(
-            name=f"{operation}_duration",
-            unit=MetricUnit.Milliseconds,
-            value=duration_ms
-        )
-        
-        metrics.add_metric(
-            name=f"{operation}_count",
-            unit=MetricUnit.Count,
-            value=1
-        )
-        
-        if not success:
-            metrics.add_metric(
-                name=f"{operation}_errors",
-                unit=MetricUnit.Count,
-                value=1
-            )
+        self.record_performance_metrics(operation, duration_ms, success)
         
+        if not _info_enabled():
+            return
         # Structured logging
-        logger.info(
-            _sanitize_message(f"Performance: {operation}"),
+        _emit_log(
+            "info",
+            "Performance: %s",
+            _sanitize_message(operation),
             extra={
                 "event_type": "performance",
                 "operation": operation,
                 "duration_ms": duration_ms,
-                "success": success,
-                "correlation_id": self.correlation_id,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "success": success
             }
         )
     
@@ -215,149 +407,183 @@ class ObservabilityManager:
                         processing_time_ms: float, behavior_detected: str) -> None:
         """Log AI inference events with model performance data"""
         # Business metrics for AI
-        metrics.add_metric(
-            name="ai_inference_confidence",
-            unit=MetricUnit.Percent,
-            value=confidence * 100
-        )
-        
-        metrics.add_metric(
-            name="ai_inference_duration",
-            unit=MetricUnit.Milliseconds,
-            value=processing_time_ms
-        )
+        _metric_buffer.add("ai_inference_confidence", _UNIT_PCT, confidence * 100)
         
-        metrics.add_metric(
-            name="ai_inference_count",
-            unit=MetricUnit.Count,
-            value=1
-        )
+        _metric_buffer.add("ai_inference_duration", _UNIT_MS, processing_time_ms)
         
-        logger.info(
-            _sanitize_message(f"AI Inference: {model_name}"),
+        if not _info_enabled():
+            return
+        _emit_log(
+            "info",
+            "AI Inference: %s",
+            _sanitize_message(model_name),
             extra={
                 "event_type": "ai_inference",
                 "model_name": model_name,
                 "input_size": input_size,
                 "confidence": confidence,
                 "processing_time_ms": processing_time_ms,
-                "behavior_detected": behavior_detected,
-                "correlation_id": self.correlation_id,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "behavior_detected": behavior_detected
             }
         )
     
-    @contextmanager
-    def trace_operation(self, operation_name: str, metadata: Optional[Dict[str, Any]] = None):
+    def trace_operation(self, operation_name: str, metadata: Optional[Dict[str, Any]] = None) -> "_TraceScope":
         """Context manager for tracing operations with automatic metrics"""
-        start_time = time.time()
-        success = True
-        error = None
+        return _TraceScope(self, operation_name, metadata)
 
-        with tracer.subsegment(operation_name) as subsegment:
-            if metadata:
-                try:
-                    subsegment.put_metadata("operation_metadata", metadata)
-                except Exception:
-                    pass
+class _TraceScope:
+    """Times an operation inside a tracer subsegment (see trace_operation)"""
+    __slots__ = ("_mgr", "_name", "_meta", "_start", "_scope", "_sub")
 
+    def __init__(self, mgr: ObservabilityManager, operation_name: str, metadata: Optional[Dict[str, Any]]):
+        self._mgr = mgr
+        self._name = operation_name
+        self._meta = metadata
+
+    def __enter__(self) -> Any:
+        self._start = time.perf_counter()
+        self._scope = _NOOP_SCOPE if _TRACING_DISABLED else tracer.subsegment(self._name)
+        subsegment = self._scope.__enter__()
+        if self._meta:
             try:
-                yield subsegment
-            except Exception as e:
-                success = False
-                error = str(e)
-                subsegment.add_exception(e)
-                raise
-            finally:
-                duration_ms = (time.time() - start_time) * 1000
-                self.log_performance_metric(operation_name, duration_ms, success)
-                if error:
-                    logger.error(
-                        _sanitize_message(f"Operation failed: {operation_name}"),
-                        extra={
-                            "operation": operation_name,
-                            "error": error,
-                            "duration_ms": duration_ms,
-                            "correlation_id": self.correlation_id
-                        }
-                    )
+                subsegment.put_metadata("operation_metadata", self._meta)
+            except Exception:
+                pass
+        self._sub = subsegment
+        return subsegment
+
+    def __exit__(self, exc_type, exc, tb) -> Any:
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        failed = isinstance(exc, Exception)
+        if failed:
+            self._sub.add_exception(exc)
+        if not _METRICS_DISABLED:
+            self._mgr.log_performance_metric(self._name, duration_ms, not failed)
+        if failed:
+            _emit_log(
+                "error",
+                "Operation failed: %s",
+                _sanitize_message(self._name),
+                extra={
+                    "operation": self._name,
+                    "error": str(exc),
+                    "duration_ms": duration_ms
+                }
+            )
+        return self._scope.__exit__(exc_type, exc, tb)
 
 # Global observability manager instance
 obs_manager = ObservabilityManager()
 
-def monitor_performance(operation_name: str, include_args: bool = False):
+class SecurityError(Exception):
+    """Raise (or subclass) for failures that should be logged as security events"""
+
+class _MonitorPerformance:
     """Decorator to monitor function performance and errors"""
-    def decorator(func: Callable) -> Callable:
+    __slots__ = ("op", "include_args", "_trace")
+
+    def __init__(self, operation_name: str, include_args: bool = False):
+        self.op = operation_name
+        self.include_args = include_args
+        self._trace = obs_manager.trace_operation
+
+    def __call__(self, func: Callable) -> Callable:
+        operation_name, trace = self.op, self._trace
+        function_name = func.__name__
+        # Subsegment metadata is discarded when tracing is disabled, so only
+        # build it (and the per-call argument details) when it will be sent
+        with_metadata = not _TRACING_DISABLED
+        include_args = self.include_args and with_metadata
+        # Identical for every call; only the include_args variant is per call
+        static_metadata = {"function_name": function_name, "operation": operation_name} if with_metadata else None
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            metadata = {"function_name": func.__name__, "operation": operation_name}
+            metadata = static_metadata
             if include_args:
-                metadata["args_count"] = len(args)
-                metadata["kwargs_keys"] = list(kwargs.keys())
+                metadata = dict(static_metadata, args_count=len(args), kwargs_keys=list(kwargs.keys()))
 
-            with obs_manager.trace_operation(operation_name, metadata):
+            with trace(operation_name, metadata):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    obs_manager.log_security_event(
-                        "function_error",
-                        "medium",
-                        {
-                            "function": func.__name__,
-                            "operation": operation_name,
-                            "error": str(e)
-                        }
-                    )
+                    # Ordinary exceptions are already recorded by trace_operation;
+                    # only security failures warrant a security event
+                    if isinstance(e, SecurityError):
+                        obs_manager.log_security_event(
+                            "function_error",
+                            "medium",
+                            {
+                                "function": function_name,
+                                "operation": operation_name,
+                                "error": str(e)
+                            }
+                        )
+                    else:
+                        logger.debug(
+                            "Function error: %s",
+                            function_name,
+                            extra={"function": function_name, "operation": operation_name, "error": str(e)}
+                        )
                     raise
         
         return wrapper
-    return decorator
 
-def log_api_request(endpoint: str, method: str, user_id: Optional[str] = None):
+monitor_performance = _MonitorPerformance
+
+class _LogApiRequest:
     """Decorator to log API requests with security context"""
-    def decorator(func: Callable) -> Callable:
+    __slots__ = ("endpoint", "method", "user_id")
+
+    def __init__(self, endpoint: str, method: str, user_id: Optional[str] = None):
+        self.endpoint = endpoint
+        self.method = method
+        self.user_id = user_id
+
+    def __call__(self, func: Callable) -> Callable:
+        endpoint, method, user_id = self.endpoint, self.method, self.user_id
+        # Constant per decorated function; computed once rather than per request
+        metric_name = f"api_{method.lower()}_{endpoint.replace('/', '_')}"
+        safe_endpoint = _sanitize_message(endpoint)
+        request_extra = {"event_type": "api_request", "endpoint": endpoint, "method": method, "user_id": user_id}
+        response_extra = {**request_extra, "event_type": "api_response", "status": "success"}
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            request_id = str(uuid.uuid4())
+            request_id = _new_cid()
             obs_manager.set_correlation_id(request_id)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            logger.info(
-                _sanitize_message(f"API Request: {method} {endpoint}"),
-                extra={
-                    "event_type": "api_request",
-                    "endpoint": endpoint,
-                    "method": method,
-                    "user_id": user_id,
-                    "request_id": request_id,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            )
+            if _info_enabled():
+                _emit_log(
+                    "info",
+                    "API Request: %s %s",
+                    method,
+                    safe_endpoint,
+                    extra=dict(request_extra, request_id=request_id)
+                )
             
             try:
                 result = func(*args, **kwargs)
                 
-                duration_ms = (time.time() - start_time) * 1000
-                obs_manager.log_performance_metric(f"api_{method.lower()}_{endpoint.replace('/', '_')}", duration_ms)
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                # The API Response record below carries the duration; no separate Performance line
+                obs_manager.record_performance_metrics(metric_name, duration_ms)
                 
-                logger.info(
-                    _sanitize_message(f"API Response: {method} {endpoint}"),
-                    extra={
-                        "event_type": "api_response",
-                        "endpoint": endpoint,
-                        "method": method,
-                        "user_id": user_id,
-                        "request_id": request_id,
-                        "duration_ms": duration_ms,
-                        "status": "success"
-                    }
-                )
+                if _info_enabled():
+                    _emit_log(
+                        "info",
+                        "API Response: %s %s",
+                        method,
+                        safe_endpoint,
+                        extra=dict(response_extra, request_id=request_id, duration_ms=duration_ms)
+                    )
                 
                 return result
                 
             except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter() - start_time) * 1000
                 
                 obs_manager.log_security_event(
                     "api_error",
@@ -371,8 +597,11 @@ def log_api_request(endpoint: str, method: str, user_id: Optional[str] = None):
                     }
                 )
                 
-                logger.error(
-                    _sanitize_message(f"API Error: {method} {endpoint}"),
+                _emit_log(
+                    "error",
+                    "API Error: %s %s",
+                    method,
+                    safe_endpoint,
                     extra={
                         "event_type": "api_error",
                         "endpoint": endpoint,
@@ -387,80 +616,100 @@ def log_api_request(endpoint: str, method: str, user_id: Optional[str] = None):
                 raise
         
         return wrapper
-    return decorator
+
+log_api_request = _LogApiRequest
 
 class HealthChecker:
     """Health check utilities for service monitoring"""
+    __slots__ = ("service_name", "start_time", "start_monotonic")
     
     def __init__(self):
         self.service_name = obs_manager.service_name
         self.start_time = datetime.now(timezone.utc)
+        self.start_monotonic = time.monotonic()
     
     def get_health_status(self) -> Dict[str, Any]:
         """Get comprehensive health status"""
         return {
             "service": self.service_name,
             "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "uptime_seconds": (datetime.now(timezone.utc) - self.start_time).total_seconds(),
+            "timestamp": _fast_utcnow_iso(),
+            "uptime_seconds": time.monotonic() - self.start_monotonic,
             "version": obs_manager.version,
             "environment": obs_manager.environment,
             "correlation_id": obs_manager.correlation_id
         }
     
-    def check_dependencies(self) -> Dict[str, Any]:
-        """Check health of external dependencies"""
-        dependencies = {}
-        
-        # Check AWS services (lightweight reachability probes)
+    @staticmethod
+    def _probe(call: Callable[[], Any]) -> Dict[str, Any]:
+        """Time a single dependency probe"""
+        if not _BOTO3_AVAILABLE:
+            return {"status": "unknown", "error": "boto3_unavailable"}
+        start = time.perf_counter()
         try:
-            if _BOTO3_AVAILABLE:
-                s3_client = boto3.client('s3')  # type: ignore
-                s3_client.list_buckets()
-                dependencies["s3"] = {"status": "healthy", "response_time_ms": 0}
-            else:
-                dependencies["s3"] = {"status": "unknown", "error": "boto3_unavailable"}
+            call()
         except Exception as e:
-            dependencies["s3"] = {"status": "unhealthy", "error": str(e)}
+            return {"status": "unhealthy", "error": str(e)}
+        return {"status": "healthy", "response_time_ms": round((time.perf_counter() - start) * 1000, 2)}
+    
+    def check_dependencies(self) -> Dict[str, Any]:
+        """Check health of external dependencies"""
+        probes = {
+            # head_bucket on one bucket instead of listing every bucket in the account
+            "s3": (lambda: _client('s3').head_bucket(Bucket=HEALTH_S3_BUCKET)) if HEALTH_S3_BUCKET else None,
+            "timestream": lambda: _client('timestream-query').describe_endpoints(),
+        }
+        dependencies: Dict[str, Any] = {"s3": {"status": "unknown", "error": "HEALTH_S3_BUCKET_not_set"}}
         
-        try:
-            if _BOTO3_AVAILABLE:
-                # Creation of client suffices as lightweight health indicator
-                boto3.client('timestream-query')  # type: ignore
-                dependencies["timestream"] = {"status": "healthy", "response_time_ms": 0}
-            else:
-                dependencies["timestream"] = {"status": "unknown", "error": "boto3_unavailable"}
-        except Exception as e:
-            dependencies["timestream"] = {"status": "unhealthy", "error": str(e)}
+        # Run probes concurrently so latency is the slowest probe, not the sum
+        futures = {
+            name: _probe_pool.submit(self._probe, call)
+            for name, call in probes.items() if call is not None
+        }
+        wait(futures.values(), timeout=HEALTH_PROBE_TIMEOUT)
+        for name, future in futures.items():
+            dependencies[name] = future.result() if future.done() else {"status": "unknown", "error": "timeout"}
         
         return {
             "service": self.service_name,
             "dependencies": dependencies,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _fast_utcnow_iso()
         }
 
 # Global health checker
 health_checker = HealthChecker()
 
 # Lambda handler decorators for automatic observability
+# Built once and shared by every handler; applied innermost-first like stacked decorators
+_HANDLER_DECORATORS = (
+    metrics.log_metrics(capture_cold_start_metric=True),
+    tracer.capture_lambda_handler,
+    logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_HTTP),
+)
+
 def lambda_handler_with_observability(func: Callable) -> Callable:
     """Complete observability wrapper for Lambda handlers"""
-    @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_HTTP)
-    @tracer.capture_lambda_handler
-    @metrics.log_metrics(capture_cold_start_metric=True)
     @wraps(func)
     def wrapper(event, context):
         # Extract correlation ID from API Gateway
-        correlation_id = event.get('headers', {}).get('x-correlation-id', str(uuid.uuid4()))
+        # Only generate an ID when the caller did not send one
+        try:
+            correlation_id = event['headers'][_CID_HEADER] or _new_cid()
+        except (KeyError, TypeError):
+            correlation_id = _new_cid()
         obs_manager.set_correlation_id(correlation_id)
         
+        # Resolved once; only scalars go into the log extras, never the event itself
+        function_name = getattr(context, 'function_name', 'unknown') if context else "unknown"
+        event_source = str(event.get('source', 'unknown')) if isinstance(event, dict) else 'unknown'
+        
         # Log request
-        logger.info(
+        _emit_log(
+            "info",
             _sanitize_message("Lambda invocation started"),
             extra={
                 "event_type": "lambda_start",
-                "function_name": getattr(context, 'function_name', 'unknown') if context else "unknown",
-                "correlation_id": correlation_id,
+                "function_name": function_name,
                 "cold_start": getattr(context, 'cold_start', False) if context else False
             }
         )
@@ -470,7 +719,8 @@ def lambda_handler_with_observability(func: Callable) -> Callable:
             
             obs_manager.log_business_event(
                 "lambda_success",
-                function_name=context.function_name if context else "unknown"
+                function_name=function_name,
+                event_source=event_source
             )
             
             return result
@@ -480,13 +730,19 @@ def lambda_handler_with_observability(func: Callable) -> Callable:
                 "lambda_error",
                 "high",
                 {
-                    "function_name": context.function_name if context else "unknown",
+                    "function_name": function_name,
                     "error": str(e),
-                    "event_source": event.get('source', 'unknown') if isinstance(event, dict) else 'unknown'
+                    "event_source": event_source
                 }
             )
             raise
+        finally:
+            # Hand the aggregated metrics to log_metrics before it serializes
+            _metric_buffer.flush()
+            flush_logs()
     
+    for decorator in _HANDLER_DECORATORS:
+        wrapper = decorator(wrapper)
     return wrapper
 
 # Export key components
@@ -498,8 +754,10 @@ __all__ = [
     'monitor_performance',
     'log_api_request',
     'lambda_handler_with_observability',
+    'flush_logs',
     'health_checker',
     'ObservabilityManager',
+    'SecurityError',
     'HealthChecker',
     'POWertools_AVAILABLE'
 ]
\ No newline at end of file
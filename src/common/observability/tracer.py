@@ -5,6 +5,7 @@ Handles distributed tracing for performance and error analysis
 
 import os
 import logging
+from functools import lru_cache
 from typing import Any, Callable, Dict, Optional, TypeVar, cast
 
 # Fallback for when X-Ray is not available
@@ -70,10 +71,14 @@ def trace_function(name: Optional[str] = None) -> Callable[[F], F]:
         return cast(F, wrapper)
     return decorator
 
+@lru_cache(maxsize=None)
 def get_tracer(service_name: str) -> Any:
     """
     Get a configured tracer instance.
     
+    The tracer is configured (and ``patch_all`` applied) once per service
+    name; repeat calls return the cached instance.
+    
     Args:
         service_name: Name of the service
         
@@ -8,64 +8,47 @@ This module implements security controls for:
 - Data redaction
 - Authentication/Authorization
 - Cryptographic operations
+
+Submodules are imported lazily (PEP 562): ``from common.security import
+RateLimiter`` loads only the rate limiter, not pydantic, jwt or cryptography.
 """
 
-from .input_validators import (
-    InputValidator,
-    validate_collar_data,
-    validate_user_feedback,
-    sanitize_text_input,
-)
-from .output_schemas import (
-    OutputValidator,
-    validate_timeline_output,
-    validate_behavior_output,
-    secure_response_wrapper,
-)
-from .rate_limiter import (
-    RateLimiter,
-    rate_limit_decorator,
-    CircuitBreaker,
-)
-from .redaction import (
-    DataRedactor,
-    redact_pii,
-    safe_log,
-)
-from .crypto_utils import (
-    SecureCrypto,
-    encrypt_sensitive_data,
-    decrypt_sensitive_data,
-    generate_secure_token,
-)
-from .auth import (
-    AuthManager,
-    verify_jwt_token,
-    create_jwt_token,
-    require_auth,
-)
+import importlib
+
+_EXPORTS = {
+    "InputValidator": ".input_validators",
+    "validate_collar_data": ".input_validators",
+    "validate_user_feedback": ".input_validators",
+    "sanitize_text_input": ".input_validators",
+    "OutputValidator": ".output_schemas",
+    "validate_timeline_output": ".output_schemas",
+    "validate_behavior_output": ".output_schemas",
+    "secure_response_wrapper": ".output_schemas",
+    "RateLimiter": ".rate_limiter",
+    "rate_limit_decorator": ".rate_limiter",
+    "CircuitBreaker": ".rate_limiter",
+    "DataRedactor": ".redaction",
+    "redact_pii": ".redaction",
+    "safe_log": ".redaction",
+    "SecureCrypto": ".crypto_utils",
+    "encrypt_sensitive_data": ".crypto_utils",
+    "decrypt_sensitive_data": ".crypto_utils",
+    "generate_secure_token": ".crypto_utils",
+    "AuthManager": ".auth",
+    "verify_jwt_token": ".auth",
+    "create_jwt_token": ".auth",
+    "require_auth": ".auth",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    "InputValidator",
-    "validate_collar_data",
-    "validate_user_feedback",
-    "sanitize_text_input",
-    "OutputValidator",
-    "validate_timeline_output",
-    "validate_behavior_output",
-    "secure_response_wrapper",
-    "RateLimiter",
-    "rate_limit_decorator",
-    "CircuitBreaker",
-    "DataRedactor",
-    "redact_pii",
-    "safe_log",
-    "SecureCrypto",
-    "encrypt_sensitive_data",
-    "decrypt_sensitive_data",
-    "generate_secure_token",
-    "AuthManager",
-    "verify_jwt_token",
-    "create_jwt_token",
-    "require_auth",
-]
+def __dir__():
+    return sorted(list(globals()) + __all__)
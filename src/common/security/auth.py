@@ -3,18 +3,45 @@ Production-grade authentication and authorization utilities with cryptographic J
 """
 
 import hashlib
+import heapq
+import hmac
+import json
+import os
 import secrets
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import Dict, Optional, Any, List
 from dataclasses import dataclass
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
 from jose.constants import ALGORITHMS
-from cryptography.hazmat.primitives.asymmetric import rsa
+from jose.utils import base64url_encode
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
 from cryptography.hazmat.primitives import serialization
 import logging
 
+try:
+    import orjson
+
+    def _json_bytes(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+except ImportError:
+    def _json_bytes(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode()
+
 logger = logging.getLogger(__name__)
 
+# Optional shared revocation store so a revocation reaches every container
+REDIS_URL = os.getenv("REDIS_URL")
+# Bumped on every shared revocation; containers re-read the revoked set only
+# when it changes, and check it at most once per REVOCATION_SYNC_SECONDS
+REVOCATION_EPOCH_KEY = "rev-epoch"
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# Reject every token while the shared store is unreachable instead of
+# falling back to the last synced revocations
+REVOCATION_FAIL_CLOSED = os.getenv("REVOCATION_FAIL_CLOSED", "false").lower() == "true"
+
 @dataclass
 class TokenPair:
     """Access and refresh token pair"""
@@ -33,83 +60,204 @@ class TokenPayload:
     token_type: str
 
 class ProductionTokenManager:
-    """Production-grade JWT token management with RSA encryption"""
+    """Production-grade JWT token management with asymmetric signing.
+    
+    Generated keys default to ES256 (ECDSA P-256), whose signatures are far
+    cheaper to produce than RS256's. Keys passed in are assumed to be the
+    RSA keys provisioned in Secrets Manager unless ``algorithm`` says otherwise.
+    Generated keys are created on first use, so importing this module (and
+    the shared ``production_token_manager``) costs no key generation.
+    """
+    
+    _GENERATED_ALGORITHMS = (ALGORITHMS.ES256, ALGORITHMS.RS256)
+    
+    # Token lifetimes in seconds
+    ACCESS_TOKEN_TTL = 900  # 15 minutes
+    REFRESH_TOKEN_TTL = 7 * 24 * 3600  # 7 days
     
-    def __init__(self, private_key: Optional[str] = None, public_key: Optional[str] = None):
-        self.algorithm = ALGORITHMS.RS256
+    def __init__(self, private_key: Optional[str] = None, public_key: Optional[str] = None,
+                 algorithm: Optional[str] = None):
         self.issuer = "petty-api"
         self.audience = "petty-clients"
         
-        # Generate RSA key pair if not provided (in production, load from secrets)
+        # Generate a key pair if not provided (in production, load from secrets)
         if private_key and public_key:
-            self.private_key = private_key
-            self.public_key = public_key
+            self.algorithm = algorithm or ALGORITHMS.RS256
+            self._private_key = private_key
+            self._public_key = public_key
         else:
-            self._generate_key_pair()
+            self.algorithm = algorithm or ALGORITHMS.ES256
+            if self.algorithm not in self._GENERATED_ALGORITHMS:
+                raise ValueError(f"Unsupported signing algorithm: {self.algorithm}")
+            self._private_key = None
+            self._public_key = None
+        # Serializes lazy key generation so concurrent first use (e.g. a
+        # threadpool) cannot produce two different key pairs
+        self._key_lock = threading.Lock()
         
-        # Token revocation list (in production, use Redis or database)
-        self._revoked_tokens = set()
+        # The header never changes for this manager; jwt.encode would rebuild it
+        self._header_b64 = base64url_encode(_json_bytes({"alg": self.algorithm, "typ": "JWT"}))
+        
+        # Revoked token IDs (jti), mirrored to Redis when REDIS_URL is set
+        self._revoked_jtis = set()
+        # Min-heap of (exp, jti); a revoked jti is dropped once its token
+        # expires, since jwt.decode rejects it from then on anyway
+        self._revocation_expiry: List[tuple] = []
+        self._redis_client = None
+        # Snapshot of the shared revocations, so verification never waits on Redis
+        self._remote_revoked: frozenset = frozenset()
+        self._remote_epoch = None
+        self._next_sync = 0.0
+        self._sync_failed = False
+    
+    @property
+    def private_key(self) -> str:
+        """PEM private key, generated on first access if none was provided"""
+        if self._private_key is None:
+            self._ensure_key_pair()
+        return self._private_key
+    
+    @property
+    def public_key(self) -> str:
+        """PEM public key, generated on first access if none was provided"""
+        if self._public_key is None:
+            self._ensure_key_pair()
+        return self._public_key
+    
+    # Parsed once; jwt.encode and jwt.decode would otherwise parse the PEM
+    # on every token
+    @cached_property
+    def _signing_key(self):
+        return jwk.construct(self.private_key, self.algorithm)
+    
+    @cached_property
+    def _verifying_key(self):
+        return jwk.construct(self.public_key, self.algorithm)
+    
+    def _ensure_key_pair(self) -> None:
+        """Generate the key pair exactly once, even under concurrent first use"""
+        with self._key_lock:
+            if self._private_key is None or self._public_key is None:
+                self._generate_key_pair()
     
     def _generate_key_pair(self):
-        """Generate RSA key pair for JWT signing"""
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-        )
+        """Generate a key pair for JWT signing matching self.algorithm"""
+        if self.algorithm == ALGORITHMS.ES256:
+            private_key = ec.generate_private_key(ec.SECP256R1())
+        elif self.algorithm == ALGORITHMS.RS256:
+            private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048,
+            )
+        else:
+            raise ValueError(f"Unsupported signing algorithm: {self.algorithm}")
         
-        self.private_key = private_key.private_bytes(
+        self._private_key = private_key.private_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.NoEncryption()
         ).decode()
         
-        self.public_key = private_key.public_key().public_bytes(
+        self._public_key = private_key.public_key().public_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         ).decode()
     
+    def _get_redis_client(self):
+        """Get the shared revocation store, or None when none is configured"""
+        if self._redis_client is None and REDIS_URL:
+            try:
+                import redis
+                self._redis_client = redis.Redis.from_url(REDIS_URL, socket_timeout=0.2)
+            except ImportError:
+                logger.warning("REDIS_URL is set but redis is not installed - revocations stay local")
+        return self._redis_client
+    
+    def _is_revoked(self, jti: Optional[str]) -> bool:
+        """Check a token ID against local revocations, then the shared store"""
+        if jti is None:
+            return False
+        if jti in self._revoked_jtis:
+            return True
+        client = self._get_redis_client()
+        if client is None:
+            return False
+        self._sync_revocations(client)
+        if self._sync_failed and REVOCATION_FAIL_CLOSED:
+            return True
+        # Fails open by default: while Redis is down the last snapshot is
+        # used, so an outage does not lock out every user of the service
+        return jti in self._remote_revoked
+    
+    def _sync_revocations(self, client) -> None:
+        """Refresh the snapshot of shared revocations once the sync interval has passed"""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + REVOCATION_SYNC_SECONDS
+        try:
+            epoch = client.get(REVOCATION_EPOCH_KEY)
+            if epoch != self._remote_epoch:
+                # Read the epoch first so a revocation made during the scan
+                # bumps it again and is picked up on the next sync
+                self._remote_revoked = frozenset(
+                    key[len(b"rev:"):].decode() for key in client.scan_iter(match="rev:*")
+                )
+                self._remote_epoch = epoch
+            self._sync_failed = False
+        except Exception as e:
+            logger.error(f"Redis revocation sync failed: {e}")
+            self._sync_failed = True
+    
+    def _sign(self, payload: Dict[str, Any]) -> str:
+        """Encode payload as a compact JWS with the cached header and key"""
+        signing_input = self._header_b64 + b"." + base64url_encode(_json_bytes(payload))
+        signature = base64url_encode(self._signing_key.sign(signing_input))
+        return (signing_input + b"." + signature).decode()
+    
     def generate_token_pair(self, user_id: str, scopes: Optional[List[str]] = None) -> TokenPair:
         """Generate access and refresh token pair"""
         if scopes is None:
             scopes = ["read"]
         
-        now = datetime.now(timezone.utc)
+        # JWT NumericDate claims are whole epoch seconds
+        now = int(time.time())
         
         # Access token (15 minutes)
         access_payload = {
             'user_id': user_id,
             'scopes': scopes,
-            'iat': now.timestamp(),
-            'exp': (now + timedelta(minutes=15)).timestamp(),
-            'nbf': now.timestamp(),
+            'iat': now,
+            'exp': now + self.ACCESS_TOKEN_TTL,
+            'nbf': now,
             'iss': self.issuer,
             'aud': self.audience,
             'token_type': 'access',
-            'jti': secrets.token_hex(16)  # Unique token ID
+            'jti': secrets.token_urlsafe(12)  # Unique token ID (16 chars, 96 bits)
         }
         
         # Refresh token (7 days)
         refresh_payload = {
             'user_id': user_id,
-            'iat': now.timestamp(),
-            'exp': (now + timedelta(days=7)).timestamp(),
-            'nbf': now.timestamp(),
+            'iat': now,
+            'exp': now + self.REFRESH_TOKEN_TTL,
+            'nbf': now,
             'iss': self.issuer,
             'aud': self.audience,
             'token_type': 'refresh',
-            'jti': secrets.token_hex(16)
+            'jti': secrets.token_urlsafe(12)
         }
         
         try:
-            access_token = jwt.encode(access_payload, self.private_key, algorithm=self.algorithm)
-            refresh_token = jwt.encode(refresh_payload, self.private_key, algorithm=self.algorithm)
+            access_token = self._sign(access_payload)
+            refresh_token = self._sign(refresh_payload)
             
             logger.info(f"Generated token pair for user {user_id} with scopes {scopes}")
             
             return TokenPair(
                 access_token=access_token,
                 refresh_token=refresh_token,
-                expires_in=900
+                expires_in=self.ACCESS_TOKEN_TTL
             )
         except Exception as e:
             logger.error(f"Failed to generate token pair: {e}")
@@ -118,19 +266,19 @@ class ProductionTokenManager:
     def verify_token(self, token: str, token_type: str = "access") -> Optional[TokenPayload]:
         """Verify and decode JWT token"""
         try:
-            # Check if token is revoked
-            if token in self._revoked_tokens:
-                logger.warning("Attempt to use revoked token")
-                return None
-            
             payload = jwt.decode(
                 token,
-                self.public_key,
+                self._verifying_key,
                 algorithms=[self.algorithm],
                 issuer=self.issuer,
                 audience=self.audience
             )
             
+            # Check if token is revoked
+            if self._is_revoked(payload.get('jti')):
+                logger.warning("Attempt to use revoked token")
+                return None
+            
             # Verify token type
             if payload.get('token_type') != token_type:
                 logger.warning(f"Token type mismatch: expected {token_type}, got {payload.get('token_type')}")
@@ -151,13 +299,48 @@ class ProductionTokenManager:
             logger.error(f"Token verification error: {e}")
             return None
     
+    def _prune_revoked(self) -> None:
+        """Forget revoked token IDs that have expired; pops only expired entries"""
+        heap = self._revocation_expiry
+        now = time.time()
+        while heap and heap[0][0] <= now:
+            _, jti = heapq.heappop(heap)
+            self._revoked_jtis.discard(jti)
+    
     def revoke_token(self, token: str) -> bool:
-        """Revoke a token (add to blacklist)"""
+        """Revoke a token (add its jti to the blacklist)"""
         try:
-            # In production, store in Redis with TTL
-            self._revoked_tokens.add(token)
+            self._prune_revoked()
+            # Only tokens this manager signed may be revoked; otherwise a forged
+            # token could blacklist any jti and pick its Redis TTL. Expired
+            # tokens still verify so revoking them is a harmless no-op.
+            claims = jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                issuer=self.issuer,
+                audience=self.audience,
+                options={"verify_exp": False}
+            )
+            jti = claims['jti']
+            exp = claims.get('exp')
+            self._revoked_jtis.add(jti)
+            if exp is not None:
+                heapq.heappush(self._revocation_expiry, (exp, jti))
+            
+            client = self._get_redis_client()
+            if client is not None:
+                ttl = max(int(exp - time.time()), 1) if exp is not None else self.REFRESH_TOKEN_TTL
+                try:
+                    client.setex(f"rev:{jti}", ttl, 1)
+                    client.incr(REVOCATION_EPOCH_KEY)
+                except Exception as e:
+                    logger.warning(f"Redis revocation write failed: {e}")
             logger.info("Token revoked successfully")
             return True
+        except JWTError as e:
+            logger.warning(f"Refusing to revoke unverifiable token: {e}")
+            return False
         except Exception as e:
             logger.error(f"Failed to revoke token: {e}")
             return False
@@ -175,25 +358,52 @@ class ProductionAPIKeyManager:
     """Production-grade API key management for service authentication"""
     
     def __init__(self):
-        # In production, use AWS Secrets Manager or database
-        self.api_keys = {}
+        # In production, use AWS Secrets Manager or database.
+        # Keyed by a truncated HMAC of the key; values are (full SHA-256, key data)
+        self.api_keys: Dict[bytes, tuple] = {}
+        self._index_secret = secrets.token_bytes(32)
+    
+    @staticmethod
+    def _hash(api_key: bytes) -> bytes:
+        """SHA-256 of an API key, compared in constant time on verification.
+        
+        hashlib is backed by OpenSSL, which already uses the CPU's SHA
+        extensions where available; the raw digest skips hex formatting.
+        """
+        return hashlib.sha256(api_key).digest()
+    
+    def _index(self, api_key: bytes) -> bytes:
+        """8-byte keyed lookup index for an API key"""
+        return hmac.digest(self._index_secret, api_key, "sha256")[:8]
+    
+    def _lookup(self, api_key: str) -> Optional[Dict[str, Any]]:
+        """Return the key data for api_key, or None if it is unknown"""
+        key_bytes = api_key.encode()
+        entry = self.api_keys.get(self._index(key_bytes))
+        if entry is None or not hmac.compare_digest(entry[0], self._hash(key_bytes)):
+            return None
+        return entry[1]
     
     def generate_api_key(self, service_name: str, permissions: Optional[List[str]] = None) -> str:
         """Generate a new API key for a service with specific permissions"""
         if permissions is None:
             permissions = ["read"]
         
-        api_key = f"pk_{secrets.token_hex(32)}"  # Longer key for better security
-        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        while True:
+            api_key = f"pk_{secrets.token_urlsafe(32)}"  # 256-bit key, base64url keeps it short
+            key_bytes = api_key.encode()
+            index = self._index(key_bytes)
+            if index not in self.api_keys:
+                break
         
-        self.api_keys[key_hash] = {
+        self.api_keys[index] = (self._hash(key_bytes), {
             'service_name': service_name,
             'permissions': permissions,
             'created_at': datetime.now(timezone.utc),
             'last_used': None,
             'usage_count': 0,
             'active': True
-        }
+        })
         
         logger.info(f"Generated API key for service {service_name} with permissions {permissions}")
         return api_key
@@ -201,14 +411,12 @@ class ProductionAPIKeyManager:
     def verify_api_key(self, api_key: str, required_permission: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Verify an API key and check permissions"""
         try:
-            key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+            key_data = self._lookup(api_key)
             
-            if key_hash not in self.api_keys or not self.api_keys[key_hash]['active']:
+            if key_data is None or not key_data['active']:
                 logger.warning("Invalid or inactive API key used")
                 return None
             
-            key_data = self.api_keys[key_hash]
-            
             # Check permission if required
             if required_permission and required_permission not in key_data['permissions']:
                 logger.warning(f"API key lacks required permission: {required_permission}")
@@ -227,9 +435,9 @@ class ProductionAPIKeyManager:
     def revoke_api_key(self, api_key: str) -> bool:
         """Revoke an API key"""
         try:
-            key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-            if key_hash in self.api_keys:
-                self.api_keys[key_hash]['active'] = False
+            key_data = self._lookup(api_key)
+            if key_data is not None:
+                key_data['active'] = False
                 logger.info("API key revoked successfully")
                 return True
             return False
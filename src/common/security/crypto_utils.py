@@ -5,7 +5,7 @@ Cryptographic utilities for data protection
 import hashlib
 import hmac
 import secrets
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 def generate_token(length: int = 32) -> str:
     """Generate a cryptographically secure random token"""
@@ -23,19 +23,38 @@ def hash_data(data: Union[str, bytes], algorithm: str = 'sha256') -> str:
     else:
         raise ValueError(f"Unsupported algorithm: {algorithm}")
 
-def secure_compare(a: str, b: str) -> bool:
-    """Securely compare two strings to prevent timing attacks"""
-    return hmac.compare_digest(a.encode('utf-8'), b.encode('utf-8'))
+def secure_compare(a: Union[str, bytes], b: Union[str, bytes]) -> bool:
+    """Securely compare two strings or byte strings to prevent timing attacks"""
+    # compare_digest takes ASCII str directly; only other text needs encoding
+    if isinstance(a, str) and isinstance(b, str) and a.isascii() and b.isascii():
+        return hmac.compare_digest(a, b)
+    if isinstance(a, str):
+        a = a.encode('utf-8')
+    if isinstance(b, str):
+        b = b.encode('utf-8')
+    return hmac.compare_digest(a, b)
 
 class DataEncryption:
     """Simple data encryption utility (mock implementation for testing)"""
     
     def __init__(self, key: Optional[str] = None):
         self.key = key or generate_token(32)
+        # Hash state with the key already absorbed; copied per plaintext
+        self._seed_ctx = hashlib.sha256(self.key.encode('utf-8'))
+    
+    def _tag(self, plaintext: str) -> str:
+        h = self._seed_ctx.copy()
+        h.update(plaintext.encode('utf-8'))
+        return h.hexdigest()[:16]
     
     def encrypt(self, plaintext: str) -> str:
         """Mock encryption - in production, use proper encryption like Fernet"""
-        return f"ENCRYPTED[{hash_data(plaintext + self.key)[:16]}]"
+        return f"ENCRYPTED[{self._tag(plaintext)}]"
+    
+    def encrypt_many(self, plaintexts: List[str]) -> List[str]:
+        """Mock-encrypt a batch of plaintexts with the same key"""
+        tag = self._tag
+        return [f"ENCRYPTED[{tag(plaintext)}]" for plaintext in plaintexts]
     
     def decrypt(self, ciphertext: str) -> str:
         """Mock decryption - in production, use proper decryption"""
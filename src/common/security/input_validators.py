@@ -13,13 +13,29 @@ logger = structlog.get_logger(__name__)
 
 # Allowed patterns for various inputs
 ALLOWED_COLLAR_ID_PATTERN = re.compile(r'^[A-Z]{2}-\d{3,6}$')
-ALLOWED_BEHAVIOR_TYPES = {
+ALLOWED_BEHAVIOR_TYPES = frozenset({
     'Deep Sleep', 'Anxious Pacing', 'Playing Fetch', 'Eating', 'Drinking',
     'Walking', 'Running', 'Resting', 'Alert', 'Unknown'
-}
+})
 MAX_TEXT_LENGTH = 1000
 MAX_COORDS_PRECISION = 6  # Decimal places for GPS coordinates
 
+# Translation table deleting C0 control characters except tab and newline
+_CTRL_DELETE = str.maketrans(dict.fromkeys(set(range(32)) - {ord('\t'), ord('\n')}))
+
+# Injection patterns stripped by sanitize_text_input, applied in this order.
+# They stay separate passes: removing one pattern can join the text around
+# it into a match for a later one (e.g. "-SELECT-" -> "--").
+_SQL_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\b(SELECT|INSERT|UPDATE|DELETE|DROP|UNION|OR|AND)\b)',
+    r'(--|/\*|\*/)',
+    r'(\b(EXEC|EXECUTE|SP_)\b)',
+))
+_CMD_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'[;&|`$()]',
+    r'\b(rm|del|format|shutdown|reboot)\b',
+))
+
 class CollarDataModel(BaseModel):
     """Secure model for collar sensor data"""
     collar_id: str = Field(..., pattern=r'^[A-Z]{2}-\d{3,6}$')
@@ -94,7 +110,7 @@ class BehaviorEventModel(BaseModel):
     def validate_behavior(cls, v: str) -> str:
         """Ensure behavior is from allowed set"""
         if v not in ALLOWED_BEHAVIOR_TYPES:
-            raise ValueError(f"Behavior must be one of: {ALLOWED_BEHAVIOR_TYPES}")
+            raise ValueError(f"Behavior must be one of: {', '.join(sorted(ALLOWED_BEHAVIOR_TYPES))}")
         return v
     
     @field_validator('metadata')
@@ -200,35 +216,25 @@ def sanitize_text_input(text: str) -> str:
     text = html.escape(text)
     
     # Remove control characters except newline and tab
-    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t')
+    text = text.translate(_CTRL_DELETE)
     
     # Remove potential SQL injection patterns
-    sql_patterns = [
-        r'(\b(SELECT|INSERT|UPDATE|DELETE|DROP|UNION|OR|AND)\b)',
-        r'(--|/\*|\*/)',
-        r'(\b(EXEC|EXECUTE|SP_)\b)',
-    ]
-    
-    for pattern in sql_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    for pattern in _SQL_PATTERNS:
+        text = pattern.sub('', text)
     
     # Remove potential command injection patterns
-    cmd_patterns = [
-        r'[;&|`$()]',
-        r'\b(rm|del|format|shutdown|reboot)\b',
-    ]
-    
-    for pattern in cmd_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    for pattern in _CMD_PATTERNS:
+        text = pattern.sub('', text)
     
     return text.strip()
 
+# Shared instance for the convenience functions; InputValidator is stateless
+_input_validator = InputValidator()
+
 def validate_collar_data(data: Dict[str, Any]) -> CollarDataModel:
     """Convenience function for collar data validation"""
-    validator = InputValidator()
-    return validator.validate_collar_data(data)
+    return _input_validator.validate_collar_data(data)
 
 def validate_user_feedback(data: Dict[str, Any]) -> UserFeedbackModel:
     """Convenience function for user feedback validation"""
-    validator = InputValidator()
-    return validator.validate_user_feedback(data)
+    return _input_validator.validate_user_feedback(data)
@@ -230,15 +230,16 @@ class OutputValidator:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
+# Shared instance for the convenience functions; OutputValidator is stateless
+_output_validator = OutputValidator()
+
 def validate_timeline_output(data: Dict[str, Any]) -> TimelineOutput:
     """Convenience function for timeline output validation"""
-    validator = OutputValidator()
-    return validator.validate_timeline_output(data)
+    return _output_validator.validate_timeline_output(data)
 
 def validate_behavior_output(data: Dict[str, Any]) -> BehaviorAnalysisOutput:
     """Convenience function for behavior output validation"""
-    validator = OutputValidator()
-    return validator.validate_behavior_output(data)
+    return _output_validator.validate_behavior_output(data)
 
 def secure_response_wrapper(
     success: bool,
@@ -248,5 +249,4 @@ def secure_response_wrapper(
     request_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Convenience function for creating secure responses"""
-    validator = OutputValidator()
-    return validator.create_secure_response(success, data, message, error_code, request_id)
+    return _output_validator.create_secure_response(success, data, message, error_code, request_id)
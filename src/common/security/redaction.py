@@ -3,7 +3,7 @@ Data redaction utilities for privacy compliance
 """
 
 import re
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Collection, Dict, List, Optional, Union
 
 # Common patterns for redaction
 EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
@@ -11,6 +11,16 @@ PHONE_PATTERN = re.compile(r'\b\d{3}-\d{3}-\d{4}\b|\b\(\d{3}\)\s*\d{3}-\d{4}\b')
 SSN_PATTERN = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
 CREDIT_CARD_PATTERN = re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b')
 
+# Matches wherever any of the patterns above would, so text without PII is
+# cleared with one scan instead of four
+_ANY_PII_PATTERN = re.compile('|'.join(
+    f'(?:{pattern.pattern})'
+    for pattern in (EMAIL_PATTERN, PHONE_PATTERN, SSN_PATTERN, CREDIT_CARD_PATTERN)
+))
+
+# Keys redacted when no explicit list is given; stored lowercase
+DEFAULT_REDACT_KEYS = frozenset({'email', 'phone', 'ssn', 'credit_card', 'password', 'token'})
+
 def redact_email(text: str, replacement: str = "[EMAIL_REDACTED]") -> str:
     """Redact email addresses from text"""
     return EMAIL_PATTERN.sub(replacement, text)
@@ -31,6 +41,8 @@ def redact_pii(text: str) -> str:
     """Comprehensive PII redaction"""
     if not isinstance(text, str):
         return text
+    if not _ANY_PII_PATTERN.search(text):
+        return text
     
     result = text
     result = redact_email(result)
@@ -40,33 +52,57 @@ def redact_pii(text: str) -> str:
     
     return result
 
-def redact_dict(data: Dict[str, Any], keys_to_redact: Optional[List[str]] = None) -> Dict[str, Any]:
+def redact_dict(data: Dict[str, Any], keys_to_redact: Optional[Collection[str]] = None) -> Dict[str, Any]:
     """Redact specified keys from dictionary"""
     if keys_to_redact is None:
-        keys_to_redact = ['email', 'phone', 'ssn', 'credit_card', 'password', 'token']
+        lowered_keys = DEFAULT_REDACT_KEYS
+    else:
+        lowered_keys = frozenset(k.lower() for k in keys_to_redact)
+    return _redact_dict(data, lowered_keys)
+
+def _redact_dict(data: Dict[str, Any], lowered_keys: frozenset) -> Dict[str, Any]:
+    """
+    redact_dict with the redacted key names already lowercased
     
+    Nested dicts are walked with an explicit stack of (source, target)
+    pairs rather than by recursion, so deep payloads neither pay a frame
+    per level nor hit the recursion limit. Each target is inserted into its
+    parent before it is filled, which keeps the original key order.
+    """
     result = {}
-    for key, value in data.items():
-        if key.lower() in [k.lower() for k in keys_to_redact]:
-            result[key] = "[REDACTED]"
-        elif isinstance(value, str):
-            result[key] = redact_pii(value)
-        elif isinstance(value, dict):
-            result[key] = redact_dict(value, keys_to_redact)
-        elif isinstance(value, list):
-            result[key] = [redact_dict(item, keys_to_redact) if isinstance(item, dict) 
-                          else redact_pii(item) if isinstance(item, str) 
-                          else item for item in value]
-        else:
-            result[key] = value
+    stack = [(data, result)]
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            if key.lower() in lowered_keys:
+                target[key] = "[REDACTED]"
+            elif isinstance(value, str):
+                target[key] = redact_pii(value)
+            elif isinstance(value, dict):
+                target[key] = nested = {}
+                stack.append((value, nested))
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    if isinstance(item, dict):
+                        nested = {}
+                        stack.append((item, nested))
+                        items.append(nested)
+                    elif isinstance(item, str):
+                        items.append(redact_pii(item))
+                    else:
+                        items.append(item)
+                target[key] = items
+            else:
+                target[key] = value
     
     return result
 
 class DataRedactor:
     """Production-grade data redaction utility"""
     
-    def __init__(self, keys_to_redact: Optional[List[str]] = None):
-        self.keys_to_redact = keys_to_redact or ['email', 'phone', 'ssn', 'credit_card', 'password', 'token']
+    def __init__(self, keys_to_redact: Optional[Collection[str]] = None):
+        self.keys_to_redact = keys_to_redact or DEFAULT_REDACT_KEYS
     
     def redact_text(self, text: str) -> str:
         """Redact PII from text"""
@@ -83,9 +119,12 @@ class DataRedactor:
         else:
             return data
 
+# Redactor used by safe_log when none is passed
+_default_redactor = DataRedactor()
+
 def safe_log(data: Union[str, Dict[str, Any], List[Any]], redactor: Optional[DataRedactor] = None) -> Union[str, Dict[str, Any], List[Any]]:
     """Safely prepare data for logging by redacting PII"""
     if redactor is None:
-        redactor = DataRedactor()
+        redactor = _default_redactor
     
     return redactor.redact_data(data)
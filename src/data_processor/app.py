@@ -86,13 +86,89 @@ timestream_client = session.client(
     region_name=AWS_REGION,
     config=boto3.session.Config(
         retries={'max_attempts': 3, 'mode': 'adaptive'},
-        max_pool_connections=50
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=10
     )
 )
 
 # Get database configuration
 db_config = get_database_config()
 
+# Dimension shared by every record written from this process; boto3 only
+# reads the record dicts, so a single instance can be reused safely.
+_ENVIRONMENT_DIMENSION = {
+    'Name': 'Environment',
+    'Value': ENVIRONMENT,
+    'DimensionValueType': 'VARCHAR'
+}
+
+def _validate_collar_inputs(
+    heart_rate: Any,
+    activity_level: Any,
+    longitude: Any,
+    latitude: Any
+) -> None:
+    """Range-check a collar reading, raising ValueError on bad input"""
+    try:
+        if not 30 <= heart_rate <= 300:
+            raise ValueError(f"Invalid heart rate: {heart_rate}")
+        if not 0 <= activity_level <= 2 or activity_level != int(activity_level):
+            raise ValueError(f"Invalid activity level: {activity_level}")
+        if not (-180 <= longitude <= 180 and -90 <= latitude <= 90):
+            raise ValueError(f"Invalid coordinates: [{longitude}, {latitude}]")
+    except TypeError:
+        raise ValueError("Collar reading values must be numeric") from None
+
+def build_collar_record(
+    collar_id: Any,
+    heart_rate: Any,
+    activity_level: Any,
+    longitude: Any,
+    latitude: Any,
+    time_ms: Optional[int] = None,
+    validate: bool = True
+) -> Dict[str, Any]:
+    """
+    Build a multi-measure Timestream record for one collar reading
+    
+    Args:
+        collar_id: Collar identifier
+        heart_rate: Heart rate in BPM
+        activity_level: Activity level (0-2)
+        longitude: GeoJSON longitude
+        latitude: GeoJSON latitude
+        time_ms: Record time in milliseconds since epoch (defaults to now)
+        validate: Range-check the reading; internal callers that already
+            validated the payload pass False
+        
+    Returns:
+        Record in the shape expected by ``write_records``
+    """
+    if validate:
+        _validate_collar_inputs(heart_rate, activity_level, longitude, latitude)
+    
+    if time_ms is None:
+        time_ms = int(time.time() * 1000)
+    
+    return {
+        'Time': str(time_ms),
+        'TimeUnit': 'MILLISECONDS',
+        'Dimensions': [
+            {'Name': 'CollarId', 'Value': str(collar_id), 'DimensionValueType': 'VARCHAR'},
+            _ENVIRONMENT_DIMENSION
+        ],
+        'MeasureName': 'CollarMetrics',
+        'MeasureValueType': 'MULTI',
+        'MeasureValues': [
+            {'Name': 'HeartRate', 'Value': str(heart_rate), 'Type': 'DOUBLE'},
+            {'Name': 'ActivityLevel', 'Value': str(activity_level), 'Type': 'BIGINT'},
+            {'Name': 'Longitude', 'Value': str(longitude), 'Type': 'DOUBLE'},
+            {'Name': 'Latitude', 'Value': str(latitude), 'Type': 'DOUBLE'}
+        ]
+    }
+
 class DataProcessor:
     """Production-grade secure data processor for collar telemetry"""
     
@@ -256,55 +332,20 @@ class DataProcessor:
             Timestream write response
         """
         try:
-            # Prepare Timestream record
-            current_time = str(int(time.time() * 1000))  # Milliseconds since epoch
-            
             # Extract location data safely
             location = data.get("location", {})
             coordinates = location.get("coordinates", [0, 0])
             longitude = coordinates[0] if len(coordinates) > 0 else 0
             latitude = coordinates[1] if len(coordinates) > 1 else 0
             
-            record = {
-                'Time': current_time,
-                'TimeUnit': 'MILLISECONDS',
-                'Dimensions': [
-                    {
-                        'Name': 'CollarId',
-                        'Value': str(data["collar_id"]),
-                        'DimensionValueType': 'VARCHAR'
-                    },
-                    {
-                        'Name': 'Environment',
-                        'Value': ENVIRONMENT,
-                        'DimensionValueType': 'VARCHAR'
-                    }
-                ],
-                'MeasureName': 'CollarMetrics',
-                'MeasureValueType': 'MULTI',
-                'MeasureValues': [
-                    {
-                        'Name': 'HeartRate',
-                        'Value': str(data["heart_rate"]),
-                        'Type': 'DOUBLE'
-                    },
-                    {
-                        'Name': 'ActivityLevel',
-                        'Value': str(data["activity_level"]),
-                        'Type': 'BIGINT'
-                    },
-                    {
-                        'Name': 'Longitude',
-                        'Value': str(longitude),
-                        'Type': 'DOUBLE'
-                    },
-                    {
-                        'Name': 'Latitude',
-                        'Value': str(latitude),
-                        'Type': 'DOUBLE'
-                    }
-                ]
-            }
+            record = build_collar_record(
+                data["collar_id"],
+                data["heart_rate"],
+                data["activity_level"],
+                longitude,
+                latitude,
+                validate=False  # Payload already validated in process_telemetry
+            )
             
             # Write to Timestream with retry logic
             response = timestream_client.write_records(
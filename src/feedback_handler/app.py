@@ -59,10 +59,16 @@ s3_client = session.client(
     region_name=AWS_REGION,
     config=boto3.session.Config(
         retries={'max_attempts': 3, 'mode': 'adaptive'},
-        max_pool_connections=20
+        max_pool_connections=20,
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=10
     )
 )
 
+# Maximum serialized size of the optional feedback segment
+MAX_SEGMENT_SIZE = 64 * 1024
+
 class FeedbackHandler:
     """Production-grade feedback handler with comprehensive validation and security"""
     
@@ -120,8 +126,7 @@ class FeedbackHandler:
                 raise ValueError("Segment must be a JSON object")
             
             # Size limit check (64KB)
-            segment_size = len(json.dumps(segment))
-            if segment_size > 64 * 1024:
+            if len(json.dumps(segment)) > MAX_SEGMENT_SIZE:
                 raise ValueError("Segment data too large (max 64KB)")
         
         return {
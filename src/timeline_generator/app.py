@@ -3,14 +3,17 @@ Production-grade timeline generator Lambda with AI behavioral analysis
 Implements comprehensive observability, security, and error handling
 """
 
+import functools
 import json
 import os
 import logging
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 
 # Import production modules
@@ -41,22 +44,204 @@ except ImportError as e:
     logger.setLevel(logging.INFO)
     logging.warning(f"Production modules not available - using fallbacks: {e}")
 
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 # Environment configuration
 TIMESTREAM_DATABASE = os.getenv("TIMESTREAM_DB", "PettyDB")
 TIMESTREAM_TABLE = os.getenv("TIMESTREAM_TABLE", "CollarMetrics")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+TS_CACHE_TTL = int(os.getenv("PETTY_TS_CACHE_TTL", "60"))  # Seconds; 0 disables caching
+REDIS_URL = os.getenv("REDIS_URL")
 
-# Initialize AWS clients
-session = boto3.Session()
-timestream_query_client = session.client(
-    'timestream-query',
-    region_name=AWS_REGION,
-    config=boto3.session.Config(
-        retries={'max_attempts': 3, 'mode': 'adaptive'},
-        max_pool_connections=20
+# AWS clients are created on first use: development and test runs serve stub
+# data and never pay for botocore model loading. boto3 clients are
+# thread-safe, so one instance is shared by the batch query workers.
+@functools.lru_cache(maxsize=1)
+def _get_timestream_query_client():
+    """Get the process-wide Timestream query client"""
+    return boto3.client(
+        'timestream-query',
+        region_name=AWS_REGION,
+        config=Config(
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            max_pool_connections=20,
+            tcp_keepalive=True,
+            connect_timeout=3,
+            read_timeout=10
+        )
     )
-)
+
+# Collar ids per batched query; keeps the IN list well under query size limits
+_QUERY_BATCH_SIZE = 50
+
+# Database and table are fixed per process, so they are baked into the
+# template once; only the per-request values are substituted at query time.
+_TIMELINE_QUERY_TEMPLATE = """
+        SELECT
+            CollarId,
+            time,
+            HeartRate,
+            ActivityLevel,
+            Longitude,
+            Latitude
+        FROM "{database}"."{table}"
+        WHERE CollarId IN ({{collar_ids}})
+            AND measure_name = 'CollarMetrics'
+            AND time between '{{start_time}}' and '{{end_time}}'
+        ORDER BY time ASC
+        """.format(database=TIMESTREAM_DATABASE, table=TIMESTREAM_TABLE)
+
+def _escape_sql_string(value: str) -> str:
+    """
+    Escape a value for use inside a single-quoted Timestream SQL literal
+    
+    The Timestream query API has no bind parameters, so user-supplied values
+    are escaped by doubling embedded single quotes.
+    """
+    return value.replace("'", "''")
+
+def _to_iso_timestamp(value: str) -> str:
+    """
+    Convert a Timestream time value to an ISO-8601 UTC string
+    
+    Timestream returns ``YYYY-MM-DD HH:MM:SS.fffffffff`` (UTC, nanoseconds);
+    that shape is sliced to millisecond precision without building a
+    datetime. Anything else goes through the full parser.
+    """
+    if len(value) >= 23 and value[10] == ' ':
+        return f"{value[:10]}T{value[11:23]}Z"
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).isoformat().replace('+00:00', 'Z')
+
+def _group_rows_by_collar(
+    rows: List[Dict[str, Any]],
+    grouped: Dict[str, List[Dict[str, Any]]]
+) -> None:
+    """
+    Convert Timestream query rows into collar data points, grouped by collar
+    
+    The data processor writes one multi-measure record per reading, so each
+    row already carries every measure and no regrouping by timestamp is
+    needed. Rows missing a measure (NullValue cells) are skipped.
+    
+    Args:
+        rows: ``Rows`` from a query response, columns as in the SELECT
+        grouped: Mapping of collar_id to data points, appended to in query order
+    """
+    # Rows for one collar usually arrive together (always, for single-collar
+    # queries), so the target list is only looked up when the collar changes.
+    last_collar_id = None
+    points: List[Dict[str, Any]] = []
+    
+    for row in rows:
+        collar_cell, time_cell, hr_cell, activity_cell, lon_cell, lat_cell = row['Data']
+        try:
+            collar_id = collar_cell['ScalarValue']
+            point = {
+                'collar_id': collar_id,
+                'timestamp': _to_iso_timestamp(time_cell['ScalarValue']),
+                'heart_rate': float(hr_cell['ScalarValue']),
+                'activity_level': int(activity_cell['ScalarValue']),
+                'location': {
+                    'type': 'Point',
+                    'coordinates': [float(lon_cell['ScalarValue']), float(lat_cell['ScalarValue'])]
+                }
+            }
+        except KeyError:
+            continue
+        if collar_id != last_collar_id:
+            points = grouped.setdefault(collar_id, [])
+            last_collar_id = collar_id
+        points.append(point)
+
+# Recent query results kept for warm-container reuse: key -> (expires_at, data)
+_query_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_QUERY_CACHE_MAX_ENTRIES = 256
+_redis_client = None
+
+def _get_redis_client():
+    """Get the shared Redis client, or None when no cache tier is configured"""
+    global _redis_client
+    if _redis_client is None and REDIS_URL:
+        try:
+            import redis
+            _redis_client = redis.Redis.from_url(REDIS_URL, socket_timeout=0.2)
+        except ImportError:
+            logging.warning("REDIS_URL is set but redis is not installed - shared cache disabled")
+    return _redis_client
+
+def _cache_get(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Look up cached collar data in process memory, then Redis"""
+    entry = _query_cache.get(key)
+    if entry is not None:
+        if entry[0] > time.time():
+            return entry[1]
+        del _query_cache[key]
+    
+    client = _get_redis_client()
+    if client is None:
+        return None
+    try:
+        cached = client.get(key)
+    except Exception as e:
+        logging.warning(f"Redis cache read failed: {e}")
+        return None
+    if cached is None:
+        return None
+    
+    data = _json_loads(cached)
+    _query_cache[key] = (time.time() + TS_CACHE_TTL, data)
+    return data
+
+def _cache_put(key: str, data: List[Dict[str, Any]]) -> None:
+    """Store collar data in process memory and Redis"""
+    now = time.time()
+    if len(_query_cache) >= _QUERY_CACHE_MAX_ENTRIES:
+        for stale_key in [k for k, (expires_at, _) in _query_cache.items() if expires_at <= now]:
+            del _query_cache[stale_key]
+        if len(_query_cache) >= _QUERY_CACHE_MAX_ENTRIES:
+            _query_cache.clear()
+    _query_cache[key] = (now + TS_CACHE_TTL, data)
+    
+    client = _get_redis_client()
+    if client is not None:
+        try:
+            client.setex(key, TS_CACHE_TTL, _json_dumps(data))
+        except Exception as e:
+            logging.warning(f"Redis cache write failed: {e}")
+
+def _iter_query_pages(query: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of every page of a Timestream query
+    
+    Timestream pages results behind NextToken. The request for the next
+    page is issued as soon as its token is known, so it is in flight while
+    the caller processes the current page.
+    
+    Args:
+        query: SQL query string
+        
+    Yields:
+        ``Rows`` of each response page, in order
+    """
+    client = _get_timestream_query_client()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(client.query, QueryString=query)
+        while future is not None:
+            response = future.result()
+            next_token = response.get('NextToken')
+            future = executor.submit(
+                client.query, QueryString=query, NextToken=next_token
+            ) if next_token else None
+            yield response['Rows']
 
 class TimelineGenerator:
     """Production-grade timeline generator with AI behavioral analysis"""
@@ -90,64 +275,80 @@ class TimelineGenerator:
     
     def _query_timestream_data(self, collar_id: str, hours_back: int) -> List[Dict[str, Any]]:
         """Query actual data from AWS Timestream"""
+        # Results are shared for the length of one TTL window; a slightly
+        # stale "last N hours" view is acceptable for timeline generation.
+        cache_key = None
+        if TS_CACHE_TTL > 0:
+            bucket = int(time.time() // TS_CACHE_TTL)
+            cache_key = f"ts:{collar_id}:{hours_back}:{bucket}"
+            cached = _cache_get(cache_key)
+            if PRODUCTION_MODULES_AVAILABLE:
+                metrics.add_metric(
+                    name="timestream_cache_hit" if cached is not None else "timestream_cache_miss",
+                    unit="Count",
+                    value=1
+                )
+            if cached is not None:
+                return cached
+        
+        result = self._query_timestream_data_many([collar_id], hours_back)[collar_id]
+        
+        if cache_key is not None:
+            _cache_put(cache_key, result)
+        
+        self.logger.info(f"Retrieved {len(result)} data points from Timestream for collar {collar_id}")
+        return result
+    
+    def _query_timestream_data_many(
+        self,
+        collar_ids: List[str],
+        hours_back: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Query data for several collars, one Timestream query per batch
+        
+        Each query carries up to ``_QUERY_BATCH_SIZE`` collar ids so the
+        fixed per-query planning cost is shared; batches run concurrently.
+        
+        Args:
+            collar_ids: Collar identifiers
+            hours_back: Number of hours of data to retrieve
+            
+        Returns:
+            Mapping of every requested collar_id to its data points
+        """
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
         
-        query = f"""
-        SELECT
-            time,
-            measure_name,
-            measure_value::double as value
-        FROM "{TIMESTREAM_DATABASE}"."{TIMESTREAM_TABLE}"
-        WHERE CollarId = '{collar_id}'
-            AND time between '{start_time.isoformat()}' and '{end_time.isoformat()}'
-        ORDER BY time ASC
-        """
+        queries = []
+        for i in range(0, len(collar_ids), _QUERY_BATCH_SIZE):
+            batch = collar_ids[i:i + _QUERY_BATCH_SIZE]
+            queries.append(_TIMELINE_QUERY_TEMPLATE.format(
+                collar_ids=", ".join(f"'{_escape_sql_string(c)}'" for c in batch),
+                start_time=start_time.isoformat(),
+                end_time=end_time.isoformat()
+            ))
+        
+        def run_query(query: str) -> Dict[str, List[Dict[str, Any]]]:
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for rows in _iter_query_pages(query):
+                _group_rows_by_collar(rows, grouped)
+            return grouped
+        
+        result: Dict[str, List[Dict[str, Any]]] = {collar_id: [] for collar_id in collar_ids}
         
         try:
-            response = timestream_query_client.query(QueryString=query)
-            
-            # Parse Timestream response into collar data format
-            data_points = {}
-            
-            for row in response['Rows']:
-                timestamp_cell = next((cell for cell in row['Data'] if 'TimestampValue' in cell), None)
-                measure_name_cell = next((cell for cell in row['Data'] if cell.get('ScalarValue') in ['HeartRate', 'ActivityLevel', 'Longitude', 'Latitude']), None)
-                value_cell = next((cell for cell in row['Data'] if 'ScalarValue' in cell and cell['ScalarValue'] not in ['HeartRate', 'ActivityLevel', 'Longitude', 'Latitude']), None)
-                
-                if timestamp_cell and measure_name_cell and value_cell:
-                    timestamp = timestamp_cell['TimestampValue']
-                    measure_name = measure_name_cell['ScalarValue']
-                    value = float(value_cell['ScalarValue'])
-                    
-                    if timestamp not in data_points:
-                        data_points[timestamp] = {
-                            'collar_id': collar_id,
-                            'timestamp': timestamp,
-                            'location': {'coordinates': [0, 0]}
-                        }
-                    
-                    if measure_name == 'HeartRate':
-                        data_points[timestamp]['heart_rate'] = value
-                    elif measure_name == 'ActivityLevel':
-                        data_points[timestamp]['activity_level'] = int(value)
-                    elif measure_name == 'Longitude':
-                        data_points[timestamp]['location']['coordinates'][0] = value
-                    elif measure_name == 'Latitude':
-                        data_points[timestamp]['location']['coordinates'][1] = value
-            
-            # Convert to list and filter complete records
-            result = []
-            for timestamp, data in sorted(data_points.items()):
-                if all(key in data for key in ['heart_rate', 'activity_level']):
-                    result.append(data)
-            
-            self.logger.info(f"Retrieved {len(result)} data points from Timestream for collar {collar_id}")
-            return result
-            
+            if len(queries) == 1:
+                result.update(run_query(queries[0]))
+            else:
+                with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+                    for grouped in executor.map(run_query, queries):
+                        result.update(grouped)
         except (ClientError, BotoCoreError) as e:
             self.logger.error(f"Timestream query failed: {e}")
             raise
+        
+        return result
     
     def _generate_stub_data(self, collar_id: str, hours_back: int = 24) -> List[Dict[str, Any]]:
         """Generate realistic stub data for development/fallback"""
@@ -411,7 +612,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 "X-Frame-Options": "DENY",
                 "X-XSS-Protection": "1; mode=block"
             },
-            "body": json.dumps(timeline_data)
+            "body": _json_dumps(timeline_data)
         }
         
         return response
@@ -0,0 +1,193 @@
+import pytest
+
+from src.common.security.auth import ProductionAPIKeyManager, ProductionTokenManager
+
+
+def test_api_key_roundtrip_and_revocation():
+    manager = ProductionAPIKeyManager()
+    api_key = manager.generate_api_key("collar-ingest", ["read", "write"])
+
+    key_data = manager.verify_api_key(api_key, required_permission="write")
+    assert key_data["service_name"] == "collar-ingest"
+    assert key_data["usage_count"] == 1
+
+    assert manager.verify_api_key(api_key, required_permission="admin") is None
+    assert manager.verify_api_key("pk_" + "0" * 64) is None
+
+    assert manager.revoke_api_key(api_key) is True
+    assert manager.verify_api_key(api_key) is None
+
+
+@pytest.mark.parametrize("algorithm", ["ES256", "RS256"])
+def test_token_pair_roundtrip(algorithm):
+    manager = ProductionTokenManager(algorithm=algorithm)
+    pair = manager.generate_token_pair("user-1", ["read", "write"])
+
+    payload = manager.verify_token(pair.access_token)
+    assert payload.user_id == "user-1"
+    assert payload.scopes == ["read", "write"]
+    assert manager.verify_token(pair.access_token, token_type="refresh") is None
+    assert manager.verify_token(pair.refresh_token, token_type="refresh").user_id == "user-1"
+
+
+def test_signed_tokens_decode_with_jose():
+    from jose import jwt
+
+    manager = ProductionTokenManager()
+    token = manager.generate_token_pair("user-2").access_token
+
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "typ": "JWT"}
+    claims = jwt.decode(token, manager.public_key, algorithms=["ES256"], audience=manager.audience, issuer=manager.issuer)
+    assert claims["user_id"] == "user-2"
+
+
+def test_revoked_tokens_are_rejected_and_pruned_after_expiry(monkeypatch):
+    from src.common.security import auth
+
+    manager = ProductionTokenManager()
+    pair = manager.generate_token_pair("user-3")
+
+    assert manager.revoke_token(pair.access_token) is True
+    assert manager.verify_token(pair.access_token) is None
+
+    later = auth.time.time() + manager.ACCESS_TOKEN_TTL + 1
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    manager._prune_revoked()
+
+    assert manager._revoked_jtis == set()
+    assert manager._revocation_expiry == []
+
+
+def test_revocation_is_per_token_id():
+    manager = ProductionTokenManager()
+    first = manager.generate_token_pair("user-4")
+    second = manager.generate_token_pair("user-4")
+
+    assert manager.revoke_token(first.refresh_token) is True
+
+    assert manager.verify_token(first.refresh_token, token_type="refresh") is None
+    assert manager.verify_token(first.access_token).user_id == "user-4"
+    assert manager.verify_token(second.refresh_token, token_type="refresh").user_id == "user-4"
+
+
+def test_generated_keys_are_created_on_first_use():
+    manager = ProductionTokenManager()
+    assert manager._private_key is None
+
+    token = manager.generate_token_pair("user-5").access_token
+    assert manager._private_key is not None
+    assert manager.verify_token(token).user_id == "user-5"
+
+    with pytest.raises(ValueError):
+        ProductionTokenManager(algorithm="HS256")
+
+
+def test_revoke_token_rejects_tokens_it_did_not_sign():
+    from jose import jwt
+
+    manager = ProductionTokenManager()
+    pair = manager.generate_token_pair("user-6")
+    victim_jti = jwt.get_unverified_claims(pair.access_token)["jti"]
+
+    forged = jwt.encode({"jti": victim_jti, "exp": 2**40}, "attacker-secret", algorithm="HS256")
+    other_signer = ProductionTokenManager().generate_token_pair("user-6").access_token
+
+    assert manager.revoke_token(forged) is False
+    assert manager.revoke_token(other_signer) is False
+    assert manager._revoked_jtis == set()
+    assert manager.verify_token(pair.access_token).user_id == "user-6"
+
+
+def test_concurrent_first_use_generates_one_key_pair(monkeypatch):
+    import threading
+
+    manager = ProductionTokenManager()
+    generate = manager._generate_key_pair
+    calls = []
+
+    def counting_generate():
+        calls.append(1)
+        generate()
+
+    monkeypatch.setattr(manager, "_generate_key_pair", counting_generate)
+    barrier = threading.Barrier(8)
+    tokens = []
+
+    def first_use():
+        barrier.wait()
+        tokens.append(manager.generate_token_pair("user-7").access_token)
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(manager.verify_token(token).user_id == "user-7" for token in tokens)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append("get")
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key.encode()] = value
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+
+    def scan_iter(self, match):
+        self.calls.append("scan")
+        return [key for key in self.data if isinstance(key, bytes) and key.startswith(b"rev:")]
+
+    def exists(self, key):
+        raise AssertionError("verification must not query Redis per token")
+
+
+def test_shared_revocations_are_synced_at_intervals(monkeypatch):
+    from src.common.security import auth
+
+    store = _FakeRedis()
+    revoker = ProductionTokenManager()
+    verifier = ProductionTokenManager(revoker.private_key, revoker.public_key, algorithm="ES256")
+    for manager in (revoker, verifier):
+        monkeypatch.setattr(manager, "_get_redis_client", lambda: store)
+    clock = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: clock[0])
+    pair = revoker.generate_token_pair("user-6")
+
+    assert verifier.verify_token(pair.access_token).user_id == "user-6"
+    assert revoker.revoke_token(pair.access_token) is True
+    # Within the sync interval the snapshot is reused without touching Redis
+    assert verifier.verify_token(pair.access_token) is not None
+    assert store.calls == ["get"]
+
+    clock[0] += auth.REVOCATION_SYNC_SECONDS
+    assert verifier.verify_token(pair.access_token) is None
+    assert store.calls == ["get", "get", "scan"]
+
+    clock[0] += auth.REVOCATION_SYNC_SECONDS
+    verifier.verify_token(pair.access_token)
+    assert store.calls == ["get", "get", "scan", "get"]
+
+
+@pytest.mark.parametrize("fail_closed", [False, True])
+def test_unreachable_revocation_store(monkeypatch, fail_closed):
+    from src.common.security import auth
+
+    class _DownRedis:
+        def get(self, key):
+            raise ConnectionError("redis down")
+
+    manager = ProductionTokenManager()
+    monkeypatch.setattr(manager, "_get_redis_client", lambda: _DownRedis())
+    monkeypatch.setattr(auth, "REVOCATION_FAIL_CLOSED", fail_closed)
+    token = manager.generate_token_pair("user-7").access_token
+
+    assert (manager.verify_token(token) is None) is fail_closed
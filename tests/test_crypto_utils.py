@@ -0,0 +1,23 @@
+import pytest
+
+from src.common.security.crypto_utils import DataEncryption, secure_compare
+
+
+def test_encrypt_many_matches_encrypt():
+    encryptor = DataEncryption("test-key")
+    plaintexts = ["alpha", "beta", ""]
+
+    assert encryptor.encrypt_many(plaintexts) == [encryptor.encrypt(p) for p in plaintexts]
+    assert encryptor.encrypt("alpha") != DataEncryption("other-key").encrypt("alpha")
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("abc123", "abc123", True),
+    ("abc123", "abc124", False),
+    (b"abc123", "abc123", True),
+    ("clé", "clé", True),
+    ("clé", b"cl\xc3\xa9", True),
+    ("clé", "cle", False),
+])
+def test_secure_compare(a, b, expected):
+    assert secure_compare(a, b) is expected
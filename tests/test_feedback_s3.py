@@ -3,6 +3,7 @@ import os
 from typing import Dict, Any
 from moto import mock_aws
 import boto3
+import pytest
 from src.feedback_handler import app as feedback_app
 
 
@@ -46,3 +47,16 @@ def test_feedback_persist_s3(monkeypatch):
     payload = json.loads(obj["Body"].read())
     assert payload["user_feedback"] == "correct"
     assert payload["segment"] == {"raw": 1}
+
+
+def test_segment_size_limit_and_unserializable_segment():
+    handler = feedback_app.FeedbackHandler()
+    payload = {"event_id": "e1", "user_feedback": "correct"}
+
+    at_limit = {"x": "a" * (feedback_app.MAX_SEGMENT_SIZE - len(json.dumps({"x": ""})))}
+    assert handler._validate_feedback_payload({**payload, "segment": at_limit})["segment"] == at_limit
+
+    with pytest.raises(ValueError):
+        handler._validate_feedback_payload({**payload, "segment": {"x": at_limit["x"] + "a"}})
+    with pytest.raises(TypeError):
+        handler._validate_feedback_payload({**payload, "segment": {"x": object()}})
@@ -0,0 +1,112 @@
+import json
+import logging
+
+from src.common.observability.logger import StructuredFormatter, StructuredLogger
+
+
+def test_sanitize_message_strips_control_characters():
+    logger = StructuredLogger("test_sanitize")
+
+    assert logger._sanitize_message("a\nb\rc\td\x00e\x7ff") == "a b c def"
+    assert len(logger._sanitize_message("x" * 5000)) == 1000
+
+
+def test_sanitize_log_data_redacts_sensitive_keys():
+    logger = StructuredLogger("test_redact")
+
+    data = logger._sanitize_log_data({
+        "API_Key": "abc",
+        "user": "bob\n",
+        "nested": {"Password": "hunter2", "count": 3},
+    })
+
+    assert data["API_Key"] == "[REDACTED]"
+    assert data["user"] == "bob "
+    assert data["nested"] == {"Password": "[REDACTED]", "count": 3}
+
+
+def test_structured_formatter_passes_json_through():
+    formatter = StructuredFormatter()
+
+    def record(msg, structured=False):
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+        if structured:
+            record._structured = True
+        return record
+
+    assert formatter.format(record('{"a": 1}', structured=True)) == '{"a": 1}'
+    formatted = json.loads(formatter.format(record("plain text")))
+    assert formatted["message"] == "plain text"
+    assert formatted["level"] == "INFO"
+    # Brace-delimited text from other loggers is not trusted as JSON
+    formatted = json.loads(formatter.format(record("{'user': 'x'}")))
+    assert formatted["message"] == "{'user': 'x'}"
+    assert formatted["level"] == "INFO"
+
+
+def test_filtered_level_skips_sanitization(monkeypatch):
+    logger = StructuredLogger("test_filtered", level="INFO")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("filtered record was sanitized")
+
+    monkeypatch.setattr(logger, "_sanitize_log_data", fail)
+    logger.debug("dropped", payload="x")
+
+
+def test_sanitize_log_data_limits_nesting_depth():
+    logger = StructuredLogger("test_depth")
+
+    data = logger._sanitize_log_data({"a": {"b": {"c": {"d": {"e": 1}}}}})
+
+    assert data == {"a": {"b": {"c": {"d": "[COMPLEX_OBJECT]"}}}}
+
+
+def test_debug_sampling(monkeypatch):
+    logger = StructuredLogger("test_sampling", level="DEBUG", sample_rate=0.0)
+    emitted = []
+    emit = lambda message, **_kwargs: emitted.append(message)
+    monkeypatch.setitem(logger._log_fn, "DEBUG", (logging.DEBUG, emit))
+    monkeypatch.setitem(logger._log_fn, "INFO", (logging.INFO, emit))
+
+    logger.debug("sampled out")
+    logger.info("always kept")
+
+    assert len(emitted) == 1
+    assert json.loads(emitted[0])["message"] == "always kept"
+
+
+def test_sanitize_log_data_cleans_repeated_and_non_string_keys():
+    logger = StructuredLogger("test_keys")
+
+    for _ in range(2):
+        data = logger._sanitize_log_data({"user id": "a", "session.token": "b", 1: "c"})
+        assert data == {"user_id": "a", "session_token": "[REDACTED]", "1": "c"}
+
+
+def test_structured_logger_output_passes_through_formatter():
+    logger = StructuredLogger("test_passthrough")
+    records = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(self.format(record))
+
+    handler = _Capture()
+    handler.setFormatter(StructuredFormatter())
+    logger.logger.addHandler(handler)
+    try:
+        logger.info("hello", user="bob")
+    finally:
+        logger.logger.removeHandler(handler)
+
+    line = json.loads(records[-1])
+    assert line["message"] == "hello" and line["user"] == "bob"
+    assert "module" not in line
+
+
+def test_json_dumps_handles_non_string_keys_and_big_ints():
+    from src.common.observability.logger import _json_dumps
+
+    assert json.loads(_json_dumps({"a": {1: "x"}})) == {"a": {"1": "x"}}
+    assert json.loads(_json_dumps({"n": 2**70})) == {"n": 2**70}
@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from src.common.observability import metrics as metrics_module
+
+
+@pytest.mark.skipif(not metrics_module.HAS_METRICS, reason="needs aws_lambda_powertools")
+def test_record_metric_publishes_immediately_under_own_namespace(monkeypatch, capsys):
+    client = metrics_module.Metrics(namespace="PetTest", service="petty-test")
+    monkeypatch.setattr(metrics_module, "_metrics_client", client)
+
+    metrics_module.record_metric("walks", 2)
+    metrics_module.record_metric("alerts", 1, dimensions={"severity": "high"})
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["_aws"]["CloudWatchMetrics"][0]["Namespace"] for r in records] == ["PetTest", "PetTest"]
+    assert records[0]["walks"] == [2.0] and records[0]["service"] == "petty-test"
+    assert records[1]["severity"] == "high"
+    assert not client.metric_set
@@ -0,0 +1,272 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.observability import powertools
+
+
+def test_health_status_uptime_is_monotonic():
+    status = powertools.health_checker.get_health_status()
+
+    assert status["status"] == "healthy"
+    assert status["uptime_seconds"] >= 0
+    assert powertools.health_checker.get_health_status()["uptime_seconds"] >= status["uptime_seconds"]
+
+
+def test_metric_buffer_sums_counts_and_keeps_other_values(monkeypatch):
+    added = []
+    monkeypatch.setattr(powertools.metrics, "add_metric", lambda **kw: added.append(kw))
+    buffer = powertools._MetricBuffer()
+
+    buffer.add("op_count", powertools.MetricUnit.Count, 1)
+    buffer.add("op_count", powertools.MetricUnit.Count, 1)
+    buffer.add("op_duration", powertools.MetricUnit.Milliseconds, 5.0)
+    buffer.add("op_duration", powertools.MetricUnit.Milliseconds, 7.0)
+    assert added == []
+
+    buffer.flush()
+
+    assert [(m["name"], m["value"]) for m in added] == [
+        ("op_count", 2),
+        ("op_duration", 5.0),
+        ("op_duration", 7.0),
+    ]
+
+
+def test_info_logs_skipped_when_level_above_info(monkeypatch):
+    calls = []
+    monkeypatch.setattr(powertools.logger, "info", lambda *a, **kw: calls.append(a))
+    monkeypatch.setattr(powertools, "_info_enabled", lambda: False)
+
+    powertools.obs_manager.log_business_event("skipped")
+    powertools.obs_manager.log_performance_metric("op", 1.0)
+
+    assert calls == []
+
+
+def test_check_dependencies_uses_cheap_probes(monkeypatch):
+    calls = []
+
+    class _FakeClient:
+        def head_bucket(self, Bucket):
+            calls.append(("head_bucket", Bucket))
+
+        def describe_endpoints(self):
+            calls.append(("describe_endpoints",))
+
+    monkeypatch.setattr(powertools, "_BOTO3_AVAILABLE", True)
+    monkeypatch.setattr(powertools, "HEALTH_S3_BUCKET", "health-bucket")
+    monkeypatch.setattr(powertools, "_client", lambda name: _FakeClient())
+
+    result = powertools.health_checker.check_dependencies()
+
+    assert result["dependencies"]["s3"]["status"] == "healthy"
+    assert result["dependencies"]["timestream"]["status"] == "healthy"
+    assert sorted(calls) == [("describe_endpoints",), ("head_bucket", "health-bucket")]
+
+
+def test_event_logs_are_emitted_synchronously(monkeypatch):
+    records = []
+    monkeypatch.setattr(powertools.logger, "info", lambda message, *args, extra=None, **kw: records.append((message % args, extra)))
+
+    powertools.obs_manager.log_business_event("order_placed", order_id="o-1")
+
+    assert records[-1][0] == "Business Event: order_placed"
+    assert records[-1][1]["order_id"] == "o-1"
+
+
+def test_trace_operation_skips_tracer_when_tracing_disabled(monkeypatch):
+    monkeypatch.setattr(powertools, "_TRACING_DISABLED", True)
+    monkeypatch.setattr(powertools.tracer, "subsegment", None, raising=False)
+
+    with powertools.obs_manager.trace_operation("noop") as subsegment:
+        subsegment.put_metadata("key", "value")
+
+    assert subsegment is powertools._NOOP_SUBSEGMENT
+
+
+def test_trace_operation_records_failure_and_reraises(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(powertools, "_TRACING_DISABLED", True)
+    monkeypatch.setattr(
+        powertools.ObservabilityManager, "log_performance_metric",
+        lambda self, name, duration_ms, success: recorded.append((name, success)),
+    )
+
+    with pytest.raises(RuntimeError):
+        with powertools.obs_manager.trace_operation("failing"):
+            raise RuntimeError("boom")
+
+    assert recorded == [("failing", False)]
+
+
+def test_fast_utcnow_iso_matches_datetime_layout():
+    from datetime import datetime, timedelta, timezone
+
+    stamp = powertools._fast_utcnow_iso()
+    parsed = datetime.fromisoformat(stamp)
+
+    assert parsed.tzinfo == timezone.utc
+    assert len(stamp) == len("2024-01-01T00:00:00.000000+00:00")
+    assert abs(datetime.now(timezone.utc) - parsed) < timedelta(seconds=5)
+
+
+def test_sanitize_message_strips_astral_chars_when_emoji_disabled(monkeypatch):
+    monkeypatch.setattr(powertools, "EMOJI_ENABLED", False)
+
+    assert powertools._sanitize_message("plain ascii") == "plain ascii"
+    assert powertools._sanitize_message("café \U0001F436 ok") == "café  ok"
+
+
+def test_json_dumps_accepts_non_string_keys():
+    assert powertools._json_loads(powertools._json_dumps({1: "a", "b": {2: 3}})) == {"1": "a", "b": {"2": 3}}
+
+
+@pytest.mark.skipif(powertools.POWertools_AVAILABLE, reason="stub logger is only used without Powertools")
+def test_stub_logger_flushes_on_warnings_and_after_interval(monkeypatch, capsys):
+    clock = [100.0]
+    monkeypatch.setattr(powertools.time, "monotonic", lambda: clock[0])
+    stub = powertools.Logger(service="test")
+
+    stub.info("buffered")
+    assert capsys.readouterr().out == ""
+    stub.warning("urgent")
+    assert capsys.readouterr().out == "[INFO] buffered | extra=\n[WARNING] urgent | extra=\n"
+
+    stub.info("first")
+    clock[0] += 2 * stub.FLUSH_INTERVAL
+    stub.info("second")
+    assert capsys.readouterr().out == "[INFO] first | extra=\n[INFO] second | extra=\n"
+
+
+def test_json_dumps_accepts_ints_wider_than_64_bits():
+    assert powertools._json_loads(powertools._json_dumps({"user_id": 2**70})) == {"user_id": 2**70}
+
+
+def test_business_event_with_big_int_is_logged(caplog):
+    with caplog.at_level("INFO"):
+        powertools.obs_manager.log_business_event("big", user_id=2**70)
+        # The stub logger serializes here and writes to stdout, not to caplog
+        powertools.flush_logs()
+
+    if powertools.POWertools_AVAILABLE:
+        assert caplog.records[-1].getMessage() == "Business Event: big"
+
+
+def test_security_events_skipped_when_level_above_warning(monkeypatch):
+    queued = []
+    monkeypatch.setattr(powertools, "_emit_log", lambda *a, **kw: queued.append(a))
+    monkeypatch.setattr(powertools, "_warning_enabled", lambda: False)
+
+    powertools.obs_manager.log_security_event("probe", "low", {"detail": "x"})
+
+    assert queued == []
+
+
+def test_log_api_request_records_request_and_response(monkeypatch):
+    queued = []
+    monkeypatch.setattr(powertools, "_emit_log", lambda level, message, *args, extra: queued.append((message % args, extra)))
+
+    @powertools.log_api_request("/v1/pets", "GET")
+    def handler():
+        return "ok"
+
+    assert handler() == "ok"
+    assert [message for message, _ in queued] == ["API Request: GET /v1/pets", "API Response: GET /v1/pets"]
+    request, response = queued[0][1], queued[1][1]
+    assert request["request_id"] == response["request_id"]
+    assert response["status"] == "success" and "duration_ms" in response
+    assert "duration_ms" not in request
+
+
+def test_new_cid_is_unique_hex_across_pool_refills():
+    ids = [powertools._new_cid() for _ in range(600)]
+
+    assert len(set(ids)) == len(ids)
+    assert all(len(cid) == 32 and int(cid, 16) >= 0 for cid in ids)
+
+
+def test_check_dependencies_reports_slow_probe_as_unknown(monkeypatch):
+    import threading
+
+    release = threading.Event()
+
+    class _SlowClient:
+        def describe_endpoints(self):
+            release.wait(5)
+
+    monkeypatch.setattr(powertools, "_BOTO3_AVAILABLE", True)
+    monkeypatch.setattr(powertools, "HEALTH_S3_BUCKET", None)
+    monkeypatch.setattr(powertools, "HEALTH_PROBE_TIMEOUT", 0.05)
+    monkeypatch.setattr(powertools, "_client", lambda name: _SlowClient())
+
+    try:
+        result = powertools.health_checker.check_dependencies()
+    finally:
+        release.set()
+
+    assert result["dependencies"]["timestream"] == {"status": "unknown", "error": "timeout"}
+    assert result["dependencies"]["s3"]["status"] == "unknown"
+
+
+@pytest.mark.parametrize(
+    "event, expected",
+    [
+        ({"headers": {"x-correlation-id": "cid-from-header"}}, "cid-from-header"),
+        ({"headers": None}, None),
+        ({}, None),
+    ],
+)
+def test_lambda_wrapper_correlation_id(monkeypatch, event, expected):
+    # X-Ray's handler capture needs a Lambda runtime segment; leave it out here
+    monkeypatch.setattr(
+        powertools,
+        "_HANDLER_DECORATORS",
+        tuple(d for d in powertools._HANDLER_DECORATORS if d != powertools.tracer.capture_lambda_handler),
+    )
+    seen = []
+
+    @powertools.lambda_handler_with_observability
+    def handler(event, context):
+        seen.append(powertools.obs_manager.correlation_id)
+        return {"statusCode": 200}
+
+    context = SimpleNamespace(
+        function_name="handler",
+        memory_limit_in_mb=128,
+        invoked_function_arn="arn:aws:lambda:us-east-1:123456789012:function:handler",
+        aws_request_id="req-1",
+    )
+
+    assert handler(event, context) == {"statusCode": 200}
+    if expected is None:
+        assert len(seen[0]) == 32
+    else:
+        assert seen[0] == expected
+
+
+def test_correlation_id_is_appended_to_logger_keys(monkeypatch):
+    records = []
+    monkeypatch.setattr(powertools.logger, "info", lambda message, *args, extra=None, **kw: records.append(extra))
+    manager = powertools.obs_manager
+    previous = manager.correlation_id
+
+    try:
+        manager.set_correlation_id("header-cid")
+        manager.log_business_event("e", user_id="u1")
+        keys = dict(powertools.logger.get_current_keys())
+    finally:
+        manager.set_correlation_id(previous)
+
+    assert keys["correlation_id"] == "header-cid"
+    assert "correlation_id" not in records[-1]
+
+
+def test_records_report_the_calling_method_as_location(caplog):
+    if not powertools.POWertools_AVAILABLE:
+        pytest.skip("location is reported by the Powertools formatter")
+
+    with caplog.at_level("INFO"):
+        powertools.obs_manager.log_business_event("located")
+
+    assert caplog.records[-1].funcName == "log_business_event"
@@ -0,0 +1,39 @@
+from src.common.security.redaction import redact_dict
+
+
+def test_redact_dict_walks_nested_values_in_order():
+    data = {
+        "Email": "owner@example.com",
+        "notes": {"Token": "abc", "text": "call 555-123-4567"},
+        "contacts": [{"phone": "1"}, "a@b.com", 3],
+    }
+
+    assert redact_dict(data) == {
+        "Email": "[REDACTED]",
+        "notes": {"Token": "[REDACTED]", "text": "call [PHONE_REDACTED]"},
+        "contacts": [{"phone": "[REDACTED]"}, "[EMAIL_REDACTED]", 3],
+    }
+    assert list(redact_dict(data, ["NOTES"])) == ["Email", "notes", "contacts"]
+
+
+def test_redact_dict_handles_deep_nesting():
+    data = current = {}
+    for _ in range(5000):
+        current["child"] = {}
+        current = current["child"]
+    current["ssn"] = "123-45-6789"
+
+    redacted = redact_dict(data)
+    for _ in range(5000):
+        redacted = redacted["child"]
+    assert redacted == {"ssn": "[REDACTED]"}
+
+
+def test_redact_pii_skips_clean_text_and_redacts_each_kind():
+    from src.common.security.redaction import redact_pii
+
+    clean = "Max walked 12 blocks on 2024-01-05"
+    assert redact_pii(clean) is clean
+    assert redact_pii(
+        "a@b.com 555-123-4567 123-45-6789 4111 1111 1111 1111"
+    ) == "[EMAIL_REDACTED] [PHONE_REDACTED] [SSN_REDACTED] [CARD_REDACTED]"
@@ -0,0 +1,53 @@
+import gzip
+import json
+
+import boto3
+from moto import mock_aws
+
+from src.common.aws import s3 as s3_helper
+
+
+@mock_aws
+def test_put_json_small_body_uncompressed(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setattr(s3_helper, "_S3", None)
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket="petty-test")
+
+    s3_helper.put_json("petty-test", "small.json", {"a": 1})
+
+    obj = client.get_object(Bucket="petty-test", Key="small.json")
+    assert "ContentEncoding" not in obj
+    assert json.loads(obj["Body"].read()) == {"a": 1}
+
+
+@mock_aws
+def test_put_json_large_body_gzip(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setattr(s3_helper, "_S3", None)
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket="petty-test")
+    payload = {"x": "a" * (s3_helper.COMPRESS_MIN_BYTES * 4)}
+
+    s3_helper.put_json("petty-test", "large.json", payload)
+
+    obj = client.get_object(Bucket="petty-test", Key="large.json")
+    assert obj["ContentEncoding"] == "gzip"
+    assert obj["ServerSideEncryption"] == "AES256"
+    assert json.loads(gzip.decompress(obj["Body"].read())) == payload
+
+
+@mock_aws
+def test_get_json_reads_compressed_and_plain_bodies(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-east-1")
+    monkeypatch.setattr(s3_helper, "_S3", None)
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket="petty-test")
+    small = {"a": 1}
+    large = {"x": "a" * (s3_helper.COMPRESS_MIN_BYTES * 4)}
+
+    s3_helper.put_json("petty-test", "small.json", small)
+    s3_helper.put_json("petty-test", "large.json", large)
+
+    assert s3_helper.get_json("petty-test", "small.json") == small
+    assert s3_helper.get_json("petty-test", "large.json") == large
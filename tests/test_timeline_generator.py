@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+from src.timeline_generator import app as timeline_app
+
+
+def _row(*values):
+    return {"Data": [{"ScalarValue": v} if v is not None else {"NullValue": True} for v in values]}
+
+
+def test_group_rows_by_collar_one_point_per_row():
+    rows = [
+        _row("SN-1", "2024-01-15 10:30:00.000000000", "72.0", "1", "-74.006", "40.7128"),
+        _row("SN-1", "2024-01-15 10:31:00.000000000", "95.0", "2", "-74.007", "40.7129"),
+    ]
+    grouped = {}
+
+    timeline_app._group_rows_by_collar(rows, grouped)
+
+    data = grouped["SN-1"]
+    assert [d["heart_rate"] for d in data] == [72.0, 95.0]
+    assert [d["activity_level"] for d in data] == [1, 2]
+    assert data[0]["collar_id"] == "SN-1"
+    assert data[0]["timestamp"] == "2024-01-15T10:30:00.000Z"
+    assert data[0]["location"] == {"type": "Point", "coordinates": [-74.006, 40.7128]}
+
+
+def test_group_rows_by_collar_skips_null_measures():
+    rows = [
+        _row("SN-1", "2024-01-15 10:30:00.000000000", None, "1", "-74.0", "40.7"),
+        _row("SN-1", "2024-01-15 10:31:00.000000000", "80.0", "0", "-74.0", "40.7"),
+    ]
+    grouped = {}
+
+    timeline_app._group_rows_by_collar(rows, grouped)
+
+    assert len(grouped["SN-1"]) == 1
+    assert grouped["SN-1"][0]["heart_rate"] == 80.0
+
+
+def test_to_iso_timestamp():
+    assert timeline_app._to_iso_timestamp("2024-01-15 10:30:45.123456789") == "2024-01-15T10:30:45.123Z"
+    assert timeline_app._to_iso_timestamp("2024-01-15T10:30:45+00:00") == "2024-01-15T10:30:45Z"
+
+
+def test_iter_query_pages_follows_next_token(monkeypatch):
+    pages = {
+        None: {"Rows": [_row("SN-1", "2024-01-15 10:30:00.000000000", "70", "0", "0", "0")], "NextToken": "p2"},
+        "p2": {"Rows": [], "NextToken": "p3"},
+        "p3": {"Rows": [_row("SN-1", "2024-01-15 10:31:00.000000000", "71", "1", "0", "0")]},
+    }
+    calls = []
+
+    def fake_query(QueryString, NextToken=None):
+        calls.append(NextToken)
+        return pages[NextToken]
+
+    monkeypatch.setattr(timeline_app, "_get_timestream_query_client", lambda: SimpleNamespace(query=fake_query))
+
+    rows = [row for page in timeline_app._iter_query_pages("SELECT 1") for row in page]
+
+    assert calls == [None, "p2", "p3"]
+    assert len(rows) == 2
+
+
+def test_query_timestream_data_served_from_cache(monkeypatch):
+    calls = []
+
+    def fake_query(QueryString, NextToken=None):
+        calls.append(QueryString)
+        return {"Rows": [_row("SN-cache", "2024-01-15 10:30:00.000000000", "70", "0", "0", "0")]}
+
+    monkeypatch.setattr(timeline_app, "_get_timestream_query_client", lambda: SimpleNamespace(query=fake_query))
+    monkeypatch.setattr(timeline_app, "_query_cache", {})
+    monkeypatch.setattr(timeline_app, "TS_CACHE_TTL", 60)
+
+    first = timeline_app.timeline_generator._query_timestream_data("SN-cache", 24)
+    second = timeline_app.timeline_generator._query_timestream_data("SN-cache", 24)
+
+    assert len(first) == 1
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_collar_id_is_escaped_in_query(monkeypatch):
+    queries = []
+
+    def fake_query(QueryString, NextToken=None):
+        queries.append(QueryString)
+        return {"Rows": []}
+
+    monkeypatch.setattr(timeline_app, "_get_timestream_query_client", lambda: SimpleNamespace(query=fake_query))
+    monkeypatch.setattr(timeline_app, "TS_CACHE_TTL", 0)
+
+    timeline_app.timeline_generator._query_timestream_data("x' OR '1'='1", 24)
+
+    assert "CollarId IN ('x'' OR ''1''=''1')" in queries[0]
+
+
+def test_query_timestream_data_many_batches_and_splits(monkeypatch):
+    queries = []
+
+    def fake_query(QueryString, NextToken=None):
+        queries.append(QueryString)
+        return {"Rows": [
+            _row("SN-0", "2024-01-15 10:30:00.000000000", "70", "0", "0", "0"),
+            _row("SN-51", "2024-01-15 10:30:00.000000000", "90", "2", "0", "0"),
+        ]}
+
+    monkeypatch.setattr(timeline_app, "_get_timestream_query_client", lambda: SimpleNamespace(query=fake_query))
+    collar_ids = [f"SN-{i}" for i in range(60)]
+
+    result = timeline_app.timeline_generator._query_timestream_data_many(collar_ids, 24)
+
+    assert len(queries) == 2
+    assert set(result) == set(collar_ids)
+    assert len(result["SN-0"]) == 1
+    assert result["SN-51"][0]["heart_rate"] == 90.0
+    assert result["SN-7"] == []